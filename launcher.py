@@ -1,3 +1,4 @@
+import multiprocessing
 import sys
 
 import pyuac
@@ -5,6 +6,7 @@ import pyuac
 from src.main import main
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     if not pyuac.isUserAdmin():
         pyuac.runAsAdmin()
     else:
@@ -22,7 +22,7 @@ a = Analysis(
     ] + datas,
     hiddenimports=[
         'PyQt5', 'PyQt5.QtCore', 'PyQt5.QtGui', 'PyQt5.QtWidgets',
-        'easyocr', 'numpy', 'cv2', 'skimage', 'pynput', 'pyautogui',
+        'easyocr', 'numpy', 'cv2', 'pynput', 'pyautogui',
         'torch', 'torchvision'
     ] + hiddenimports,
     hookspath=[],
@@ -1,20 +1,30 @@
+import threading
 import time
 from typing import List, Tuple
 
-import pyautogui
+# There is a single mouse; concurrent scan sessions take turns moving it
+_mouse_lock = threading.Lock()
 
 
 class ClickAutomation:
-    def __init__(self) -> None:
+    def __init__(self, offset: Tuple[int, int] = (0, 0)) -> None:
         self.click_sequence: List[Tuple[int, int, int]] = [(738, 987, 2), (126, 403, 1)]
+        self.offset: Tuple[int, int] = offset
 
     def execute_sequence(self) -> None:
         """Executes the predefined sequence of clicks."""
         for x, y, delay in self.click_sequence:
-            pyautogui.click(x, y)
-            time.sleep(delay)
+            self.perform_click(x, y, delay)
 
-    def perform_click(self, x: int, y: int, delay: int = 0) -> None:
+    def perform_click(self, x: int, y: int, delay: float = 0) -> None:
         """Performs a single click at the specified coordinates with a delay."""
-        pyautogui.click(x, y)
+        # Imported on use: pyautogui needs a display, which headless runs lack
+        import pyautogui
+
+        with _mouse_lock:
+            pyautogui.click(x + self.offset[0], y + self.offset[1])
         time.sleep(delay)
+
+    def wait(self, seconds: float) -> None:
+        """Waits for the game to react, e.g. to a screen transition."""
+        time.sleep(seconds)
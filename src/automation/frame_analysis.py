@@ -0,0 +1,160 @@
+import logging
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import Config
+from src.data.database import NikkeDatabase
+from src.data.frame_log import FrameLog
+from src.data.roster import RosterIndex
+from src.utils.image_processor import ImageProcessor
+
+logger = logging.getLogger(__name__)
+
+# Names shared by several characters; these always need the image comparison
+AMBIGUOUS_NAMES = ["rei", "quency"]
+
+
+class FrameLogAnalyzer:
+    """Identifies the characters of a capture-only scan from its frame log.
+
+    The rarity of every frame is submitted up front, and the name and combat
+    power of each frame that passes the rarity filter as soon as its rarity
+    is known, so with an ``OCRWorkerPool`` all cores stay busy. An
+    in-process reader (``Config.OCR_WORKERS = 0``, as in the GUI) runs each
+    request as it is submitted, so there the analysis is serial.
+    Popup probes need the live game, so characters the name does not settle
+    are narrowed by rarity and burst and resolved by portrait comparison.
+    """
+
+    def __init__(
+        self,
+        image_processor: ImageProcessor,
+        roster: RosterIndex,
+        selected_rarities: Optional[List[str]] = None,
+    ) -> None:
+        self.image_processor = image_processor
+        self.roster = roster
+        self.selected_rarities = selected_rarities or ["SSR", "SR", "R"]
+
+    def analyze(self, frame_log: FrameLog) -> List[Dict[str, Any]]:
+        ocr = self.image_processor.ocr_processor
+
+        # Copy every ROI out of the map before handing it to OCR
+        records = [
+            {field: np.array(record[field]) for field in record.dtype.names}
+            for record in frame_log
+        ]
+        rarity_futures: List[Future] = [
+            ocr.submit_rarity_roi(
+                self.image_processor.preprocess_image(record["rarity"]).copy()
+            )
+            for record in records
+        ]
+
+        # Frames passing the rarity filter, with their name and CP requests
+        selected: List[Tuple[Dict[str, np.ndarray], str, Future, Future]] = []
+        for record, rarity_future in zip(records, rarity_futures):
+            rarity = self.image_processor.validate_result(
+                rarity_future.result(timeout=Config.OCR_RESULT_TIMEOUT),
+                self.image_processor.classify_color(record["rarity"]),
+            )
+            if rarity not in self.selected_rarities:
+                if rarity == "Unknown":
+                    logger.warning(
+                        f"Frame {record['index']}: skipped, rarity could not be read"
+                    )
+                else:
+                    logger.info(
+                        f"Frame {record['index']}: skipped {rarity} character, "
+                        f"not selected for processing"
+                    )
+                continue
+            cp_roi = record["cp_r"] if rarity == "R" else record["cp_sr"]
+            selected.append(
+                (
+                    record,
+                    rarity,
+                    ocr.submit_name_roi(record["name"]),
+                    ocr.submit_name_roi(cp_roi),
+                )
+            )
+
+        results: List[Dict[str, Any]] = []
+        for record, rarity, name_future, cp_future in selected:
+            nikke = self._identify(
+                record, rarity, name_future.result(timeout=Config.OCR_RESULT_TIMEOUT)
+            )
+            if nikke is None:
+                logger.warning(f"Frame {record['index']}: unable to identify character")
+                continue
+
+            nikke_info = dict(nikke)
+            nikke_info["combat_power"] = cp_future.result(
+                timeout=Config.OCR_RESULT_TIMEOUT
+            )
+            nikke_info["rarity"] = rarity
+            results.append(nikke_info)
+
+        return results
+
+    def _identify(
+        self, record: Dict[str, np.ndarray], rarity: str, name: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        if name and name.lower() not in AMBIGUOUS_NAMES:
+            by_name = self.roster.find_by_name(name)
+            if len(by_name) == 1:
+                return by_name[0]
+
+        candidates = self.roster.where("rarity", rarity) or self.roster.all()
+
+        burst = self.image_processor.identify_burst_roi(record["burst"])
+        if burst:
+            candidates = [n for n in candidates if n["burst"] == burst] or candidates
+
+        if len(candidates) == 1:
+            return candidates[0]
+
+        by_image = {n["images"]["big"]: n for n in candidates}
+        match = self.image_processor.match_reference(
+            record["portrait"], list(by_image), self.image_processor.load_portrait
+        )
+        return by_image[match[0]] if match else None
+
+
+def analyze_frame_log(
+    path: Path,
+    roster: RosterIndex,
+    selected_rarities: Optional[List[str]] = None,
+    image_processor: Optional[ImageProcessor] = None,
+    data_folder: Optional[Path] = None,
+) -> str:
+    """Runs the analysis pass over a frame log and stores the results.
+
+    Pass the caller's ``image_processor`` to reuse its OCR models; without
+    one, a temporary processor configured by ``Config.OCR_WORKERS`` is
+    started for the pass. Returns the path of the output file.
+    """
+    owns_processor = image_processor is None
+    if image_processor is None:
+        image_processor = ImageProcessor()
+
+    frame_log: Optional[FrameLog] = None
+    database: Optional[NikkeDatabase] = None
+    try:
+        frame_log = FrameLog(path, readonly=True)
+        database = NikkeDatabase(data_folder)
+        analyzer = FrameLogAnalyzer(image_processor, roster, selected_rarities)
+        for nikke_info in analyzer.analyze(frame_log):
+            database.add_or_update_character(nikke_info["name"], nikke_info)
+        return database.current_file
+    finally:
+        if database is not None:
+            database.finish_scan()
+            database.close()
+        if frame_log is not None:
+            frame_log.close()
+        if owns_processor:
+            image_processor.close()
@@ -0,0 +1,199 @@
+import math
+import statistics
+import time
+from collections import Counter, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from src.config import Config
+
+Nikke = Dict[str, Any]
+Ranking = List[Tuple[Nikke, float]]
+
+
+class IdentificationStep:
+    """One way of narrowing down the candidates for the character on screen.
+
+    Attribute steps read a value (``probe``) and keep the candidates whose
+    ``attribute`` matches it. A ranking step (``rank``) scores the candidates,
+    e.g. by comparing portraits, and settles the character when its best
+    score clearly leads.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        attribute: Optional[str] = None,
+        probe: Optional[Callable[[], Optional[str]]] = None,
+        rank: Optional[Callable[[List[Nikke]], Ranking]] = None,
+    ) -> None:
+        self.name = name
+        self.attribute = attribute
+        self.probe = probe
+        self.rank = rank
+
+
+def entropy(counts: List[int]) -> float:
+    total = sum(counts)
+    return -sum(c / total * math.log2(c / total) for c in counts if c) if total else 0
+
+
+def expected_gain(candidates: List[Nikke], attribute: str) -> float:
+    """Expected bits learned by reading ``attribute``, all candidates equally likely."""
+    return entropy(list(Counter(n.get(attribute) for n in candidates).values()))
+
+
+class IdentificationPlanner:
+    """Chooses identification steps by expected information gain per second.
+
+    Step costs start from ``Config.IDENTIFICATION_STEP_COSTS`` and follow an
+    exponential moving average of the measured durations, so slow popup probes
+    are only used when the cheap on-screen checks cannot split the candidates.
+
+    A portrait ranking settles the character only if the best score leads the
+    runner-up by ``Config.PORTRAIT_MATCH_MIN_MARGIN``; otherwise the probes go
+    on and the ranking only breaks the tie they leave. Its expected gain is
+    weighted by the share of rankings that cleared the margin, measured the
+    same way as the costs. With an initial share of 0, the default until the
+    margin is calibrated, the ranking is never picked ahead of the probes
+    and only breaks the tie they leave; its margins are still recorded.
+    """
+
+    def __init__(
+        self,
+        default_costs: Optional[Dict[str, float]] = None,
+        smoothing: float = Config.IDENTIFICATION_COST_SMOOTHING,
+        portrait_min_margin: float = Config.PORTRAIT_MATCH_MIN_MARGIN,
+        portrait_accept_rate: float = Config.PORTRAIT_MATCH_ACCEPT_RATE,
+        log: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self.costs: Dict[str, float] = dict(
+            default_costs or Config.IDENTIFICATION_STEP_COSTS
+        )
+        self.smoothing = smoothing
+        self.portrait_min_margin = portrait_min_margin
+        self.portrait_accept_rate = portrait_accept_rate
+        # Recent top-1/top-2 score margins, reported by the simulator
+        self.portrait_margins: Deque[float] = deque(maxlen=1000)
+        self.log = log or (lambda message: None)
+
+    def record_cost(self, name: str, seconds: float) -> None:
+        previous = self.costs.get(name)
+        if previous is None:
+            self.costs[name] = seconds
+        else:
+            self.costs[name] = previous + self.smoothing * (seconds - previous)
+
+    def record_margin(self, margin: float) -> bool:
+        """Tracks a ranking margin; returns whether it settles the character."""
+        accepted = margin >= self.portrait_min_margin
+        self.portrait_margins.append(margin)
+        self.portrait_accept_rate += self.smoothing * (
+            float(accepted) - self.portrait_accept_rate
+        )
+        return accepted
+
+    def margin_stats(self) -> Dict[str, Optional[float]]:
+        margins = list(self.portrait_margins)
+        return {
+            "count": len(margins),
+            "median": statistics.median(margins) if margins else None,
+            "min": min(margins) if margins else None,
+            "accept_rate": self.portrait_accept_rate,
+        }
+
+    def _gain(self, step: IdentificationStep, candidates: List[Nikke]) -> float:
+        if step.rank is not None:
+            return self.portrait_accept_rate * math.log2(len(candidates))
+        return expected_gain(candidates, step.attribute or "")
+
+    def next_step(
+        self,
+        candidates: List[Nikke],
+        steps: List[IdentificationStep],
+        done: Set[str],
+    ) -> Optional[IdentificationStep]:
+        best: Optional[IdentificationStep] = None
+        best_rate = 0.0
+        for step in steps:
+            if step.name in done:
+                continue
+            gain = self._gain(step, candidates)
+            rate = gain / max(self.costs.get(step.name, 1.0), 1e-3)
+            if gain > 0 and rate > best_rate:
+                best, best_rate = step, rate
+        return best
+
+    def _run_ranking(
+        self, step: IdentificationStep, candidates: List[Nikke]
+    ) -> Tuple[Optional[Nikke], Dict[int, float]]:
+        """Returns the ranked pick if its lead is decisive, and every score."""
+        ranking = step.rank(candidates) if step.rank else []
+        scores = {id(n): score for n, score in ranking}
+        if not ranking:
+            return None, scores
+        runner_up = ranking[1][1] if len(ranking) > 1 else None
+        if runner_up is None:
+            # Only one reference could be compared; nothing to measure a lead against
+            return (ranking[0][0] if len(candidates) == 1 else None), scores
+
+        margin = ranking[0][1] - runner_up
+        if self.record_margin(margin):
+            self.log(f"Portrait match {ranking[0][0]['name']} leads by {margin:.3f}")
+            return ranking[0][0], scores
+        self.log(f"Portrait match margin {margin:.3f} too small; probing further")
+        return None, scores
+
+    def identify(
+        self, candidates: List[Nikke], steps: List[IdentificationStep]
+    ) -> Optional[Nikke]:
+        done: Set[str] = set()
+        # Ranking scores by candidate, used to break a tie the probes cannot split
+        scores: Dict[int, float] = {}
+        while len(candidates) > 1:
+            step = self.next_step(candidates, steps, done)
+            if step is None:
+                if scores:
+                    return self._best_scored(candidates, scores)
+                # Nothing left that splits the candidates; fall back to the ranking
+                step = next((s for s in steps if s.rank and s.name not in done), None)
+                if step is None:
+                    return None
+                done.add(step.name)
+                ranking = step.rank(candidates) if step.rank else []
+                if len(ranking) > 1:
+                    self.portrait_margins.append(ranking[0][1] - ranking[1][1])
+                return ranking[0][0] if ranking else None
+            done.add(step.name)
+
+            start = time.perf_counter()
+            if step.rank is not None:
+                pick, scores = self._run_ranking(step, candidates)
+                self.record_cost(step.name, time.perf_counter() - start)
+                if pick is not None:
+                    return pick
+                continue
+
+            value = step.probe() if step.probe else None
+            self.record_cost(step.name, time.perf_counter() - start)
+            if not value:
+                continue
+
+            self.log(f"Detected {step.name}: {value}")
+            candidates = [n for n in candidates if n.get(step.attribute) == value]
+            self.log(f"Filtered to {len(candidates)} possible Nikkes")
+
+        if len(candidates) == 1:
+            self.log(f"Unique Nikke identified: {candidates[0]['name']}")
+            return candidates[0]
+        self.log("No matching Nikkes found. Stopping identification process.")
+        return None
+
+    def _best_scored(
+        self, candidates: List[Nikke], scores: Dict[int, float]
+    ) -> Optional[Nikke]:
+        scored = [n for n in candidates if id(n) in scores]
+        if not scored:
+            return None
+        best = max(scored, key=lambda n: scores[id(n)])
+        self.log(f"Best remaining portrait match: {best['name']}")
+        return best
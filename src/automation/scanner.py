@@ -0,0 +1,472 @@
+import datetime
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.automation.click_sequence import ClickAutomation
+from src.automation.frame_analysis import AMBIGUOUS_NAMES
+from src.automation.planner import IdentificationPlanner, IdentificationStep
+from src.automation.screen import ScreenCapture
+from src.config import Config
+from src.data.checkpoint import ScanCheckpoint
+from src.data.database import NikkeDatabase
+from src.data.frame_log import FrameLog
+from src.data.roster import RosterIndex
+from src.utils.fingerprint import (
+    FingerprintSet,
+    crop,
+    frame_fingerprint,
+    hamming_distance,
+)
+from src.utils.image_processor import ImageProcessor
+from src.utils.localization import get_localized_text as _
+
+logger = logging.getLogger(__name__)
+
+WEAPON_MAP: Dict[str, str] = {
+    "Sniper Rifle": "SR",
+    "Submachine Gun": "SMG",
+    "Machine Gun": "MG",
+    "Assault Rifle": "AR",
+    "Shotgun": "SG",
+    "Rocket Launcher": "RL",
+}
+
+
+class Scanner:
+    """The per-character scan loop of one game instance, without any UI.
+
+    Each ``step`` handles one frame: the first call runs the initial click
+    sequence, later calls capture, identify and store the character on screen
+    and click through to the next one. ``step`` returns ``COMPLETED`` once the
+    roster has wrapped around to the first character.
+    """
+
+    RUNNING = "running"
+    COMPLETED = "completed"
+
+    def __init__(
+        self,
+        image_processor: ImageProcessor,
+        roster: RosterIndex,
+        database: NikkeDatabase,
+        click_automation: Optional[ClickAutomation] = None,
+        screen: Optional[ScreenCapture] = None,
+        checkpoint: Optional[ScanCheckpoint] = None,
+        frame_log_dir: Path = Config.FRAME_LOG_DIR,
+        log: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self.image_processor = image_processor
+        self.roster = roster
+        self.database = database
+        self.click_sequence = click_automation or ClickAutomation()
+        self.screen = screen or ScreenCapture()
+        self.checkpoint = checkpoint or ScanCheckpoint(Config.CHECKPOINT_FILE)
+        self.frame_log_dir = Path(frame_log_dir)
+        self.log = log or logger.info
+        self.planner = IdentificationPlanner(log=self.log)
+
+        self.selected_rarities: List[str] = ["SSR", "SR", "R"]
+        self.capture_only: bool = Config.CAPTURE_ONLY_MODE
+        self.frame_log: Optional[FrameLog] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self.current_step = 0
+        self.first_nikke_name: Optional[str] = None
+        self.first_fingerprint: Optional[int] = None
+        self.last_fingerprint: Optional[int] = None
+        self.seen_fingerprints = FingerprintSet()
+        # Frames fully handled this session, with the identified name if any
+        self.completed_fingerprints: Dict[int, Optional[str]] = {}
+        self.checkpoint_dirty = False
+        self.resuming = False
+        self.resume_skipped = 0
+        self.processed_nikkes = 0
+        # Captures in a row that still showed the previous character
+        self.unchanged_frames = 0
+        self._previous_fingerprint: Optional[int] = None
+        # Characters passed over when a repeated click and a late one both landed
+        self.skipped_characters = 0
+        # Characters identified this run after the first one
+        self.identified_since_first = 0
+
+    def start(self, resume_state: Optional[Dict[str, Any]] = None) -> None:
+        self._reset()
+        if resume_state is not None:
+            self._restore_checkpoint(resume_state)
+        else:
+            self.checkpoint.clear()
+            if self.capture_only:
+                timestamp = datetime.datetime.now().strftime("%Y_%m_%d_%H_%M_%S")
+                self.frame_log = FrameLog(
+                    self.frame_log_dir / Config.get_frame_log_file(timestamp).name
+                )
+                self.log(f"Capturing frames to {self.frame_log.path}")
+
+    def stop(self) -> Optional[Path]:
+        """Ends the run; returns the frame log written in capture-only mode."""
+        self.current_step = 0
+        self.database.finish_scan()
+        if self.frame_log is None:
+            return None
+        self.frame_log.close()
+        path, self.frame_log = self.frame_log.path, None
+        return path
+
+    def step(self) -> str:
+        try:
+            if self.current_step == 0:
+                self.log("Executing initial click sequence...")
+                self.click_sequence.execute_sequence()
+                self.log("Click sequence completed. Starting character processing...")
+                self.current_step = 1
+                return self.RUNNING
+            return self._process_frame()
+        finally:
+            if self.checkpoint_dirty:
+                self._save_checkpoint()
+
+    def _process_frame(self) -> str:
+        self.log("Capturing screenshot...")
+        screenshot = self.screen.grab()
+        self.log("Screenshot captured")
+
+        status = self._register_frame(screenshot)
+        if status is not None:
+            return status
+
+        try:
+            return self._analyze_frame(screenshot)
+        except Exception:
+            # Forget the frame so the next capture retries it instead of
+            # taking it for a screen that has not changed
+            self._forget_frame()
+            raise
+
+    def _analyze_frame(self, screenshot: np.ndarray) -> str:
+        if self.frame_log is not None:
+            index = self.frame_log.append(screenshot, self.last_fingerprint)
+            self.processed_nikkes += 1
+            self._mark_completed()
+            self.log(f"Captured frame {index}")
+            self._move_to_next_character(Config.CAPTURE_CLICK_DELAY)
+            return self.RUNNING
+
+        rarity = self.image_processor.identify_rarity(screenshot)
+        self.log(f"Detected rarity: {rarity}")
+
+        if rarity == "Unknown":
+            self.log("Unable to determine rarity. Analyzing character...")
+        elif rarity not in self.selected_rarities:
+            self.log(f"Skipping {rarity} character as it's not selected for processing")
+            self._mark_completed()
+            self._move_to_next_character()
+            return self.RUNNING
+
+        coords = Config.ATTRIBUTE_COORDS[rarity]
+
+        cp = coords["cp"]
+        cp_roi = screenshot[cp["top"] : cp["bottom"], cp["left"] : cp["right"]]
+        name_roi = crop(screenshot, Config.NAME_ROI)
+        # Both ROIs are in flight together when an OCR worker pool is configured
+        cp_future = self.image_processor.submit_roi(cp_roi)
+        name_future = self.image_processor.submit_roi(name_roi)
+
+        cp_value = cp_future.result(timeout=Config.OCR_RESULT_TIMEOUT)
+        self.log(f"Extracted Combat Power: {cp_value}")
+
+        ocr_result = name_future.result(timeout=Config.OCR_RESULT_TIMEOUT)
+        self.log(f"OCR Result: {ocr_result}")
+
+        matching_nikkes = self.roster.find_by_name(ocr_result) if ocr_result else []
+        if ocr_result and ocr_result.lower() not in AMBIGUOUS_NAMES:
+            if len(matching_nikkes) == 1:
+                nikke_info = matching_nikkes[0]
+                self.log(f"Unique Nikke identified by name: {nikke_info['name']}")
+                if self._is_cycle_completed(nikke_info["name"]):
+                    return self._complete()
+                nikke_info["combat_power"] = cp_value
+                nikke_info["rarity"] = rarity
+                self._handle_character(nikke_info)
+                self._mark_completed(nikke_info["name"])
+                self._move_to_next_character()
+                return self.RUNNING
+            elif len(matching_nikkes) > 1:
+                self.log(
+                    f"Multiple Nikkes found with name {ocr_result}. Proceeding with detailed identification."
+                )
+            else:
+                self.log(
+                    f"No Nikke found with name {ocr_result}. Proceeding with detailed identification."
+                )
+        elif ocr_result:
+            self.log(
+                "Nikke named Rei or Quency detected. Proceeding with detailed identification due to multiple characters with this name."
+            )
+
+        # If not uniquely identified by name or is "Rei", continue with detailed process
+        nikke_info = self._get_nikke_info(screenshot, coords, rarity, matching_nikkes)
+
+        if nikke_info:
+            if self._is_cycle_completed(nikke_info["name"]):
+                return self._complete()
+            nikke_info["combat_power"] = cp_value
+            nikke_info["rarity"] = rarity
+            self._handle_character(nikke_info)
+            self._mark_completed(nikke_info["name"])
+        else:
+            self.log("Failed to identify Nikke. Moving to next character.")
+
+        self._move_to_next_character()
+        return self.RUNNING
+
+    def _register_frame(self, screenshot: np.ndarray) -> Optional[str]:
+        """Records the frame fingerprint; returns a status if the frame must not be analyzed."""
+        fingerprint = frame_fingerprint(screenshot)
+        match = self.seen_fingerprints.find(fingerprint)
+
+        if match is None:
+            self.resuming = False
+            self.unchanged_frames = 0
+            self._previous_fingerprint = self.last_fingerprint
+            if self.first_fingerprint is None:
+                self.first_fingerprint = fingerprint
+            self.seen_fingerprints.add(fingerprint)
+            self.last_fingerprint = fingerprint
+            return None
+
+        if match == self.last_fingerprint:
+            # The transition to the next character has not rendered yet, or
+            # the click was lost; after a few captures the click is repeated
+            self.unchanged_frames += 1
+            if self.unchanged_frames < Config.SCAN_UNCHANGED_RECLICK_FRAMES:
+                self.log("Screen unchanged since last capture. Waiting...")
+            else:
+                self.unchanged_frames = 0
+                self._reclick(match)
+        elif match == self.first_fingerprint and not (
+            # After a resume the roster starts over at the first character
+            self.resuming
+            and self.resume_skipped == 0
+        ):
+            return self._complete()
+        else:
+            self.log("Character already scanned in this run. Skipping.")
+            if self.resuming:
+                self.resume_skipped += 1
+            self.unchanged_frames = 0
+            self.last_fingerprint = match
+            self._move_to_next_character(Config.CAPTURE_CLICK_DELAY)
+        return self.RUNNING
+
+    def _forget_frame(self) -> None:
+        fingerprint = self.last_fingerprint
+        if fingerprint is None:
+            return
+        self.seen_fingerprints.discard(fingerprint)
+        if self.first_fingerprint == fingerprint:
+            self.first_fingerprint = None
+        self.last_fingerprint = self._previous_fingerprint
+
+    def _reclick(self, stalled: int) -> None:
+        """Repeats a next-character click that did not change the screen.
+
+        A lost click and a slow transition look the same, so the screen is
+        checked right after the repeat and again after a normal transition: a
+        second change means both clicks landed and one character was passed
+        over, which is logged rather than assumed away.
+        """
+        self.log("Screen still unchanged. Clicking again.")
+        self.click_sequence.perform_click(
+            Config.CLICK_X, Config.CLICK_Y, Config.CAPTURE_CLICK_DELAY
+        )
+        early = frame_fingerprint(self.screen.grab())
+        self.click_sequence.wait(1)
+        late = frame_fingerprint(self.screen.grab())
+
+        max_distance = Config.FINGERPRINT_MAX_DISTANCE
+        if (
+            hamming_distance(early, stalled) > max_distance
+            and hamming_distance(late, early) > max_distance
+        ):
+            self.skipped_characters += 1
+            logger.warning(
+                "The stalled click landed after the repeated one; a character "
+                "was passed over without being scanned"
+            )
+            self.log(
+                f"Skipped characters after repeated clicks: {self.skipped_characters}"
+            )
+
+    def _is_cycle_completed(self, name: str) -> bool:
+        """Name check backing up the fingerprint one, whose portrait can drift."""
+        if self.first_nikke_name is None:
+            self.first_nikke_name = name
+            self.log(_("First Nikke detected: {name}").format(name=name))
+            return False
+        if name != self.first_nikke_name:
+            self.identified_since_first += 1
+            return False
+        # A resumed run starts over at the first character, which is no wrap-around
+        return self.identified_since_first > 0
+
+    def _complete(self) -> str:
+        self.log(_("Cycle completed. Stopping automation."))
+        self.checkpoint_dirty = False
+        self.checkpoint.clear()
+        return self.COMPLETED
+
+    def _mark_completed(self, name: Optional[str] = None) -> None:
+        if self.last_fingerprint is not None:
+            self.completed_fingerprints[self.last_fingerprint] = name
+            self.checkpoint_dirty = True
+
+    def _save_checkpoint(self) -> None:
+        self.checkpoint.save(
+            {
+                "position": self.processed_nikkes,
+                "first_fingerprint": (
+                    None
+                    if self.first_fingerprint is None
+                    else format(self.first_fingerprint, "x")
+                ),
+                "first_nikke_name": self.first_nikke_name,
+                "completed": {
+                    format(fingerprint, "x"): name
+                    for fingerprint, name in self.completed_fingerprints.items()
+                },
+                "results": self.database.get_all_characters(),
+                "output_file": self.database.current_file,
+                "history_session_id": self.database.session_id,
+                "frame_log": (
+                    None if self.frame_log is None else str(self.frame_log.path)
+                ),
+                "selected_rarities": self.selected_rarities,
+            }
+        )
+        self.checkpoint_dirty = False
+
+    def _restore_checkpoint(self, state: Dict[str, Any]) -> None:
+        if state.get("first_fingerprint"):
+            self.first_fingerprint = int(state["first_fingerprint"], 16)
+        self.first_nikke_name = state.get("first_nikke_name")
+        self.completed_fingerprints = {
+            int(fingerprint, 16): name
+            for fingerprint, name in state.get("completed", {}).items()
+        }
+        for fingerprint in self.completed_fingerprints:
+            self.seen_fingerprints.add(fingerprint)
+        self.processed_nikkes = state.get("position", 0)
+        self.database.resume(
+            state["output_file"],
+            state.get("results", []),
+            state.get("history_session_id"),
+        )
+        if state.get("frame_log"):
+            self.frame_log = FrameLog(Path(state["frame_log"]))
+        self.selected_rarities = list(
+            state.get("selected_rarities", self.selected_rarities)
+        )
+
+        self.resuming = True
+        self.log(
+            f"Resuming scan: {len(self.completed_fingerprints)} characters already done"
+        )
+
+    def _move_to_next_character(self, delay: float = 1) -> None:
+        self.log(_("Clicking to move to next character."))
+        self.click_sequence.perform_click(Config.CLICK_X, Config.CLICK_Y, delay)
+
+    def _get_nikke_info(
+        self,
+        screenshot: np.ndarray,
+        coords: Dict[str, Dict[str, int]],
+        rarity: str,
+        candidates: Optional[List[Dict[str, Any]]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        # Characters sharing the OCR'd name are a much smaller starting set
+        filtered_nikkes: List[Dict[str, Any]] = (
+            candidates or self.roster.where("rarity", rarity) or self.roster.all()
+        )
+
+        steps = [
+            IdentificationStep(
+                "rarity",
+                "rarity",
+                probe=lambda: rarity if rarity in Config.ATTRIBUTE_COORDS else None,
+            ),
+            IdentificationStep(
+                "burst",
+                "burst",
+                probe=lambda: self.image_processor.identify_burst(screenshot),
+            ),
+            IdentificationStep(
+                "portrait",
+                rank=lambda nikkes: self._rank_portraits(screenshot, nikkes),
+            ),
+            IdentificationStep(
+                "element",
+                "element",
+                probe=lambda: self._get_attribute(
+                    (coords["element"]["x"], coords["element"]["y"]),
+                    (837, 540, 242, 57),
+                ),
+            ),
+            IdentificationStep(
+                "weapon",
+                "weapon",
+                probe=lambda: WEAPON_MAP.get(
+                    self._get_attribute(
+                        (coords["weapon"]["x"], coords["weapon"]["y"]),
+                        (825, 402, 380, 40),
+                    )
+                    or "",
+                ),
+            ),
+            IdentificationStep(
+                "squad",
+                "squad",
+                probe=lambda: self._get_attribute(
+                    (coords["squad"]["x"], coords["squad"]["y"]), (723, 299, 487, 51)
+                ),
+            ),
+        ]
+
+        return self.planner.identify(filtered_nikkes, steps)
+
+    def _get_attribute(
+        self,
+        click_pos: Tuple[int, int],
+        screenshot_region: Tuple[int, int, int, int],
+        valid_values: Optional[List[str]] = None,
+    ) -> Optional[str]:
+        self.click_sequence.perform_click(*click_pos, 1)
+        screenshot = self.screen.grab_region(screenshot_region)
+        attribute = self.image_processor.process_roi(screenshot)
+        self.log(f"Attribute: {attribute}")
+        self.click_sequence.perform_click(10, 10, 0)
+        return attribute if valid_values is None or attribute in valid_values else None
+
+    def _rank_portraits(
+        self, screenshot: np.ndarray, nikkes: List[Dict[str, Any]]
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        nikke_image = crop(screenshot, Config.PORTRAIT_ROI)
+        by_image = {nikke["images"]["big"]: nikke for nikke in nikkes}
+        ranking = self.image_processor.rank_references(
+            nikke_image, list(by_image), self.image_processor.load_portrait
+        )
+        return [(by_image[key], score) for key, score in ranking]
+
+    def _handle_character(self, nikke_info: Dict[str, Any]) -> None:
+        name: str = nikke_info["name"]
+        self.log(f"Identified Nikke: {name}")
+
+        if self.database.add_or_update_character(name, nikke_info):
+            self.log(f"Updated database for {name}")
+            self.processed_nikkes += 1
+            self.log(_("Processed Nikkes: {count}").format(count=self.processed_nikkes))
+        else:
+            self.log(f"Failed to update database for {name}")
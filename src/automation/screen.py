@@ -0,0 +1,45 @@
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class ScreenCapture:
+    """Grabs frames of one game instance.
+
+    ``origin`` is the top-left corner of the instance on the desktop; all
+    coordinates handed to this class are relative to it, so the ROIs in
+    ``Config`` work unchanged for any instance rendering at 1920x1080.
+    """
+
+    def __init__(
+        self,
+        origin: Tuple[int, int] = (0, 0),
+        size: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        self.origin = origin
+        self.size = size
+
+    def grab(self) -> np.ndarray:
+        """Returns the whole instance as a BGR image."""
+        # Imported on use: pyautogui needs a display, which headless runs lack
+        import pyautogui
+
+        if self.origin == (0, 0) and self.size is None:
+            screenshot = pyautogui.screenshot()
+        else:
+            width, height = self.size or (1920, 1080)
+            screenshot = pyautogui.screenshot(
+                region=(self.origin[0], self.origin[1], width, height)
+            )
+        return cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+
+    def grab_region(self, region: Tuple[int, int, int, int]) -> np.ndarray:
+        """Returns ``(left, top, width, height)`` of the instance as a BGR image."""
+        import pyautogui
+
+        left, top, width, height = region
+        screenshot = pyautogui.screenshot(
+            region=(left + self.origin[0], top + self.origin[1], width, height)
+        )
+        return cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
@@ -0,0 +1,239 @@
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.automation.click_sequence import ClickAutomation
+from src.automation.frame_analysis import analyze_frame_log
+from src.automation.scanner import Scanner
+from src.automation.screen import ScreenCapture
+from src.config import Config
+from src.data.checkpoint import ScanCheckpoint
+from src.data.database import NikkeDatabase
+from src.data.roster import RosterIndex
+from src.utils.image_processor import ImageProcessor, OCRProcessor
+from src.utils.log_sink import configure_logging
+from src.utils.memory import MemoryMonitor
+from src.utils.ocr_pool import OCRWorkerPool
+
+logger = logging.getLogger(__name__)
+
+
+class ScanSession:
+    """One game instance scanned on its own thread.
+
+    The session owns its capture region, click offset, output folder,
+    checkpoint and database; OCR and the roster come from the manager and are
+    shared with the other sessions. The database is opened on the session
+    thread because its SQLite history connection cannot cross threads.
+    """
+
+    IDLE = "idle"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    STOPPED = "stopped"
+    FAILED = "failed"
+
+    def __init__(
+        self,
+        name: str,
+        image_processor: ImageProcessor,
+        roster: RosterIndex,
+        origin: Tuple[int, int] = (0, 0),
+        click_offset: Optional[Tuple[int, int]] = None,
+        output_dir: Optional[Path] = None,
+        selected_rarities: Optional[List[str]] = None,
+        capture_only: bool = Config.CAPTURE_ONLY_MODE,
+        click_automation: Optional[ClickAutomation] = None,
+        screen: Optional[ScreenCapture] = None,
+    ) -> None:
+        self.name = name
+        self.image_processor = image_processor
+        self.roster = roster
+        self.origin = tuple(origin)
+        self.click_offset = tuple(click_offset or origin)
+        self.output_dir = Path(output_dir or Config.SESSIONS_DIR / name)
+        self.selected_rarities = selected_rarities or ["SSR", "SR", "R"]
+        self.capture_only = capture_only
+        # Stand-ins for the desktop, e.g. a simulated game
+        self.click_automation = click_automation
+        self.screen = screen
+
+        self.checkpoint = ScanCheckpoint(self.output_dir / Config.CHECKPOINT_FILE.name)
+        self.status = self.IDLE
+        self.processed_nikkes = 0
+        # Characters in the session's output file once it has ended
+        self.stored = 0
+        self.output_file: Optional[str] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def log(self, message: str) -> None:
+        logger.info(f"[{self.name}] {message}")
+
+    def start(self, resume: bool = False) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self.status = self.RUNNING
+        self._thread = threading.Thread(
+            target=self._run, args=(resume,), name=f"scan-{self.name}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self, resume: bool) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        database = NikkeDatabase(self.output_dir)
+        scanner = Scanner(
+            self.image_processor,
+            self.roster,
+            database,
+            self.click_automation or ClickAutomation(self.click_offset),
+            self.screen or ScreenCapture(self.origin),
+            self.checkpoint,
+            frame_log_dir=self.output_dir / Config.FRAME_LOG_DIR.name,
+            log=self.log,
+        )
+        scanner.selected_rarities = self.selected_rarities
+        scanner.capture_only = self.capture_only
+
+        frame_log_path = None
+        try:
+            resume_state = self.checkpoint.load() if resume else None
+            if resume and resume_state is None:
+                self.log("No interrupted scan to resume; starting over.")
+            scanner.start(resume_state)
+            self.log("Session started")
+
+            while not self._stop_event.is_set():
+                try:
+                    status = scanner.step()
+                except Exception:
+                    logger.exception(f"[{self.name}] Error in scan step")
+                    status = Scanner.RUNNING
+                self.processed_nikkes = scanner.processed_nikkes
+                if status == Scanner.COMPLETED:
+                    self.status = self.COMPLETED
+                    break
+                self._stop_event.wait(Config.SCAN_STEP_INTERVAL_MS / 1000)
+            else:
+                self.status = self.STOPPED
+        except Exception:
+            logger.exception(f"[{self.name}] Session failed")
+            self.status = self.FAILED
+        finally:
+            frame_log_path = scanner.stop()
+            self.output_file = database.current_file
+            self.stored = len(database.get_all_characters())
+            database.close()
+            self.log(f"Session {self.status}: {self.processed_nikkes} Nikkes processed")
+
+        if frame_log_path is not None:
+            self.log(f"Analyzing frame log {frame_log_path}...")
+            self.output_file = analyze_frame_log(
+                frame_log_path,
+                self.roster,
+                self.selected_rarities,
+                self.image_processor,
+                self.output_dir,
+            )
+            self.log(f"Frame log analysis saved to {self.output_file}")
+
+
+class SessionManager:
+    """Runs several scan sessions at once over one OCR pool and one roster.
+
+    Sessions spend most of their time waiting on clicks, screen transitions
+    and OCR, so a single worker pool sized to the machine keeps every core
+    busy while each instance advances independently.
+    """
+
+    def __init__(
+        self,
+        roster: Optional[RosterIndex] = None,
+        workers: Optional[int] = None,
+        image_processor: Optional[ImageProcessor] = None,
+    ) -> None:
+        self.roster = roster or RosterIndex.load(Config.GENERATED_DATA_FILE)
+        self.image_processor = image_processor or ImageProcessor(
+            OCRProcessor(OCRWorkerPool(workers))
+        )
+        self.sessions: Dict[str, ScanSession] = {}
+        self.memory_monitor = MemoryMonitor()
+        self.memory_monitor.register(
+            "images",
+            self.image_processor.memory_usage,
+            self.image_processor.shed_memory,
+        )
+        self.memory_monitor.register("roster", self.roster.memory_bytes)
+
+    def add_session(self, name: str, **options: Any) -> ScanSession:
+        if name in self.sessions:
+            raise ValueError(f"Duplicate scan session name: {name}")
+        session = ScanSession(name, self.image_processor, self.roster, **options)
+        self.sessions[name] = session
+        return session
+
+    def start_all(self, resume: bool = False) -> None:
+        self.memory_monitor.start()
+        for session in self.sessions.values():
+            session.start(resume)
+
+    def stop_all(self) -> None:
+        for session in self.sessions.values():
+            session.stop()
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        for session in self.sessions.values():
+            session.join(timeout)
+
+    def is_running(self) -> bool:
+        return any(session.is_alive() for session in self.sessions.values())
+
+    def close(self) -> None:
+        self.stop_all()
+        self.wait()
+        self.memory_monitor.stop()
+        self.image_processor.close()
+
+
+def main(resume: bool = False) -> None:
+    configure_logging()
+    if not Config.SCAN_SESSIONS:
+        logger.error("No scan sessions configured in Config.SCAN_SESSIONS")
+        return
+
+    manager = SessionManager()
+    try:
+        for options in Config.SCAN_SESSIONS:
+            options = dict(options)
+            manager.add_session(options.pop("name"), **options)
+        manager.start_all(resume)
+        while manager.is_running():
+            manager.wait(timeout=1)
+    except KeyboardInterrupt:
+        logger.info("Stopping scan sessions...")
+    finally:
+        manager.close()
+        for session in manager.sessions.values():
+            logger.info(
+                f"{session.name}: {session.status}, output {session.output_file}"
+            )
+
+
+if __name__ == "__main__":
+    import multiprocessing
+    import sys
+
+    multiprocessing.freeze_support()
+    main(resume="--resume" in sys.argv[1:])
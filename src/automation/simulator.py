@@ -0,0 +1,351 @@
+import argparse
+import cProfile
+import logging
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from src.automation.click_sequence import ClickAutomation
+from src.automation.scanner import Scanner
+from src.automation.screen import ScreenCapture
+from src.automation.session_manager import SessionManager
+from src.config import Config
+from src.data.checkpoint import ScanCheckpoint
+from src.data.database import NikkeDatabase
+from src.data.roster import RosterIndex
+from src.utils.image_processor import ImageProcessor
+from src.utils.log_sink import configure_logging
+from src.utils.memory import MIB, ByteLRUCache
+
+logger = logging.getLogger(__name__)
+
+POPUP_ATTRIBUTES = ["element", "weapon", "squad"]
+
+
+class SimulatedGame:
+    """Plays back recorded character screens and reacts to clicks like the game.
+
+    A recording is a folder of full 1920x1080 character detail screenshots,
+    shown in file name order, either directly in the folder or under
+    ``characters/``. The popup opened by an attribute click is looked up as
+    ``popups/<screenshot stem>_<element|weapon|squad>.png``; without one the
+    character screen stays visible.
+
+    Clicking the next-character button shows the following screenshot after
+    ``transition_delay`` seconds and wraps around after the last one. Attribute
+    icons open their popup after ``popup_delay`` seconds, and any click while a
+    popup is open or opening closes it. Clicking the first entry of the
+    character list goes back to the first screenshot.
+    """
+
+    def __init__(
+        self,
+        characters: List[Path],
+        popups: Optional[Dict[Tuple[int, str], Path]] = None,
+        transition_delay: float = Config.SIMULATOR_TRANSITION_DELAY,
+        popup_delay: float = Config.SIMULATOR_POPUP_DELAY,
+        hit_radius: int = 15,
+        cache_bytes: int = 256 * MIB,
+    ) -> None:
+        if not characters:
+            raise ValueError("A simulated game needs at least one character screen")
+        self.characters = characters
+        self.popups = popups or {}
+        self.transition_delay = transition_delay
+        self.popup_delay = popup_delay
+        self.hit_radius = hit_radius
+
+        self.list_entry = ClickAutomation().click_sequence[-1][:2]
+        self.next_button = (Config.CLICK_X, Config.CLICK_Y)
+        self.attribute_buttons = [
+            (attribute, (layout[attribute]["x"], layout[attribute]["y"]))
+            for layout in Config.ATTRIBUTE_COORDS.values()
+            for attribute in POPUP_ATTRIBUTES
+        ]
+
+        self._lock = threading.Lock()
+        # Decoded frames; a 1080p frame is 6 MiB, so long recordings are bounded
+        self._images = ByteLRUCache(cache_bytes)
+        self.index = 0
+        self.popup: Optional[str] = None
+        # Screen shown until a transition or popup finishes rendering
+        self._pending: Optional[Tuple[float, int, Optional[str]]] = None
+        self.clicks = 0
+        self.ignored_clicks = 0
+        self.frames_rendered = 0
+
+    @classmethod
+    def from_directory(cls, directory: Path, **options: Any) -> "SimulatedGame":
+        directory = Path(directory)
+        character_dir = directory / "characters"
+        if not character_dir.is_dir():
+            character_dir = directory
+        characters = sorted(character_dir.glob("*.png"))
+
+        popups: Dict[Tuple[int, str], Path] = {}
+        for index, path in enumerate(characters):
+            for attribute in POPUP_ATTRIBUTES:
+                popup = directory / "popups" / f"{path.stem}_{attribute}.png"
+                if popup.exists():
+                    popups[(index, attribute)] = popup
+        return cls(characters, popups, **options)
+
+    def _hit(self, x: int, y: int, target: Tuple[int, int]) -> bool:
+        return (
+            abs(x - target[0]) <= self.hit_radius
+            and abs(y - target[1]) <= self.hit_radius
+        )
+
+    def _settle(self) -> None:
+        if self._pending is not None and time.monotonic() >= self._pending[0]:
+            _ready, self.index, self.popup = self._pending
+            self._pending = None
+
+    def _schedule(self, delay: float, index: int, popup: Optional[str]) -> None:
+        self._pending = (time.monotonic() + delay, index, popup)
+
+    def click(self, x: int, y: int) -> None:
+        with self._lock:
+            self._settle()
+            self.clicks += 1
+            opening_popup = self._pending is not None and self._pending[2] is not None
+            if self.popup is not None or opening_popup:
+                self.popup = None
+                self._pending = None
+            elif self._hit(x, y, self.next_button):
+                next_index = (self.index + 1) % len(self.characters)
+                self._schedule(self.transition_delay, next_index, None)
+            elif self._hit(x, y, self.list_entry):
+                self._schedule(self.transition_delay, 0, None)
+            else:
+                for attribute, position in self.attribute_buttons:
+                    if self._hit(x, y, position):
+                        self._schedule(self.popup_delay, self.index, attribute)
+                        break
+                else:
+                    self.ignored_clicks += 1
+
+    def _load(self, path: Path) -> np.ndarray:
+        image = self._images.get(path)
+        if image is None:
+            image = cv2.imread(str(path), cv2.IMREAD_COLOR)
+            if image is None:
+                raise FileNotFoundError(f"Unable to read recorded frame {path}")
+            # Frames are shared by every grab; nobody may draw on them
+            image.flags.writeable = False
+            self._images.put(path, image)
+        return image
+
+    def frame(self) -> np.ndarray:
+        with self._lock:
+            self._settle()
+            self.frames_rendered += 1
+            path = self.characters[self.index]
+            if self.popup is not None:
+                path = self.popups.get((self.index, self.popup), path)
+            return self._load(path)
+
+
+class SimulatedClickAutomation(ClickAutomation):
+    """Sends clicks to a simulated game; ``time_scale`` shortens the waits after them."""
+
+    def __init__(self, game: SimulatedGame, time_scale: float = 1.0) -> None:
+        super().__init__()
+        self.game = game
+        self.time_scale = time_scale
+
+    def perform_click(self, x: int, y: int, delay: float = 0) -> None:
+        self.game.click(x, y)
+        time.sleep(delay * self.time_scale)
+
+    def wait(self, seconds: float) -> None:
+        time.sleep(seconds * self.time_scale)
+
+
+class SimulatedScreen(ScreenCapture):
+    def __init__(self, game: SimulatedGame) -> None:
+        super().__init__()
+        self.game = game
+
+    def grab(self) -> np.ndarray:
+        return self.game.frame()
+
+    def grab_region(self, region: Tuple[int, int, int, int]) -> np.ndarray:
+        left, top, width, height = region
+        return self.game.frame()[top : top + height, left : left + width]
+
+
+def simulate_scan(
+    game: SimulatedGame,
+    image_processor: ImageProcessor,
+    roster: RosterIndex,
+    output_dir: Path,
+    time_scale: float = 1.0,
+    max_steps: int = 10000,
+) -> Dict[str, Any]:
+    """Scans a simulated game on the calling thread and reports the timings."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    database = NikkeDatabase(output_dir)
+    scanner = Scanner(
+        image_processor,
+        roster,
+        database,
+        SimulatedClickAutomation(game, time_scale),
+        SimulatedScreen(game),
+        ScanCheckpoint(output_dir / Config.CHECKPOINT_FILE.name),
+        frame_log_dir=output_dir / Config.FRAME_LOG_DIR.name,
+    )
+    interval = Config.SCAN_STEP_INTERVAL_MS / 1000 * time_scale
+
+    steps = 0
+    status = Scanner.RUNNING
+    start = time.perf_counter()
+    try:
+        scanner.start()
+        while status != Scanner.COMPLETED and steps < max_steps:
+            try:
+                status = scanner.step()
+            except Exception:
+                # Like a scan session: log the failed step and carry on
+                logger.exception("Error in scan step")
+                status = Scanner.RUNNING
+            steps += 1
+            time.sleep(interval)
+    finally:
+        elapsed = time.perf_counter() - start
+        scanner.stop()
+        database.close()
+
+    return {
+        "completed": status == Scanner.COMPLETED,
+        "elapsed": elapsed,
+        "steps": steps,
+        "characters": len(game.characters),
+        "stored": len(database.get_all_characters()),
+        "skipped": scanner.skipped_characters,
+        "clicks": game.clicks,
+        "frames": game.frames_rendered,
+        "characters_per_second": len(game.characters) / elapsed if elapsed else 0.0,
+        "output_file": database.current_file,
+        "step_costs": dict(scanner.planner.costs),
+        "portrait_margins": scanner.planner.margin_stats(),
+    }
+
+
+def simulate_sessions(
+    recording_dir: Path,
+    instances: int,
+    roster: RosterIndex,
+    output_dir: Path,
+    time_scale: float = 1.0,
+    timeout: Optional[float] = None,
+    image_processor: Optional[ImageProcessor] = None,
+    **game_options: Any,
+) -> Dict[str, Any]:
+    """Runs ``instances`` simulated games side by side through a SessionManager."""
+    manager = SessionManager(roster, image_processor=image_processor)
+    games = []
+    for i in range(instances):
+        game = SimulatedGame.from_directory(recording_dir, **game_options)
+        games.append(game)
+        manager.add_session(
+            f"sim{i}",
+            output_dir=Path(output_dir) / f"sim{i}",
+            click_automation=SimulatedClickAutomation(game, time_scale),
+            screen=SimulatedScreen(game),
+        )
+
+    start = time.perf_counter()
+    try:
+        manager.start_all()
+        manager.wait(timeout)
+    finally:
+        elapsed = time.perf_counter() - start
+        manager.close()
+
+    characters = sum(len(game.characters) for game in games)
+    return {
+        "completed": all(s.status == s.COMPLETED for s in manager.sessions.values()),
+        "elapsed": elapsed,
+        "instances": instances,
+        "characters": characters,
+        "stored": sum(s.stored for s in manager.sessions.values()),
+        "stored_per_session": {name: s.stored for name, s in manager.sessions.items()},
+        "clicks": sum(game.clicks for game in games),
+        "frames": sum(game.frames_rendered for game in games),
+        "characters_per_second": characters / elapsed if elapsed else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Time a full scan against recorded screenshots, without a desktop."
+    )
+    parser.add_argument("recording", type=Path)
+    parser.add_argument("--instances", type=int, default=1)
+    parser.add_argument(
+        "--transition-delay", type=float, default=Config.SIMULATOR_TRANSITION_DELAY
+    )
+    parser.add_argument(
+        "--popup-delay", type=float, default=Config.SIMULATOR_POPUP_DELAY
+    )
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=1.0,
+        help="factor applied to the scanner's own click waits (0 skips them)",
+    )
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument(
+        "--profile", type=Path, default=None, help="write cProfile stats (1 instance)"
+    )
+    args = parser.parse_args()
+
+    configure_logging()
+    roster = RosterIndex.load(Config.GENERATED_DATA_FILE)
+    output_dir = args.output or Path(tempfile.mkdtemp(prefix="nikke_ocr_sim_"))
+    game_options = {
+        "transition_delay": args.transition_delay,
+        "popup_delay": args.popup_delay,
+    }
+
+    if args.instances > 1:
+        report = simulate_sessions(
+            args.recording,
+            args.instances,
+            roster,
+            output_dir,
+            args.time_scale,
+            **game_options,
+        )
+    else:
+        game = SimulatedGame.from_directory(args.recording, **game_options)
+        image_processor = ImageProcessor()
+        profiler = cProfile.Profile() if args.profile else None
+        try:
+            if profiler is not None:
+                profiler.enable()
+            report = simulate_scan(
+                game, image_processor, roster, output_dir, args.time_scale
+            )
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(str(args.profile))
+            image_processor.close()
+
+    for key, value in report.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    import multiprocessing
+
+    multiprocessing.freeze_support()
+    main()
@@ -15,22 +15,103 @@ class Config:
 
     GENERATED_DIR = BASE_DIR / "generated"
     USER_DATA_DIR = BASE_DIR / "output"
+    HISTORY_DB_FILE = USER_DATA_DIR / "history.sqlite3"
+    FRAME_LOG_DIR = USER_DATA_DIR / "frames"
+    CHECKPOINT_FILE = USER_DATA_DIR / "scan_checkpoint.json"
+    SESSIONS_DIR = USER_DATA_DIR / "sessions"
 
     IMAGES_DIR = STATIC_DIR / "images"
     LANG_DIR = STATIC_DIR / "lang"
 
     GENERATED_IMAGES_DIR = GENERATED_DIR / "images" / "characters"
     GENERATED_DATA_FILE = GENERATED_DIR / "data" / "nikke_data.json"
+    OCR_MODEL_CACHE_DIR = GENERATED_DIR / "models"
+    OCR_BENCHMARK_DIR = GENERATED_DIR / "benchmark"
 
     @classmethod
     def get_user_data_file(cls, timestamp):
         return cls.USER_DATA_DIR / f"nikke_ocr_{timestamp}.json"
 
+    @classmethod
+    def get_frame_log_file(cls, timestamp):
+        return cls.FRAME_LOG_DIR / f"frames_{timestamp}.bin"
+
+    LOG_LEVEL = "INFO"
+    # Messages held between UI flushes, flush period, and lines kept in the log view
+    LOG_BUFFER_SIZE = 500
+    LOG_FLUSH_INTERVAL_MS = 250
+    LOG_MAX_LINES = 1000
+
     OCR_LANGUAGE = "en"
+    # "easyocr" (stock models) or "easyocr-int8" (quantized, traced recognizer)
+    OCR_BACKEND = "easyocr"
+    # Number of OCR worker processes; 0 keeps a single in-process reader
+    OCR_WORKERS = 0
+    # Torch threads per OCR worker; 0 splits the available cores evenly
+    OCR_TORCH_THREADS = 0
+    # Seconds to wait for one OCR result before the scan step fails
+    OCR_RESULT_TIMEOUT = 120
+    # Low-memory mode: OCR models load on first use and unload after the idle
+    # timeout, and memory is reported per component at INFO level
+    LOW_MEMORY_MODE = False
+    OCR_IDLE_UNLOAD_SECONDS = 120
+    # Per-process resident memory ceiling in MiB (0 disables it); above it the
+    # idle models and caches are released
+    MEMORY_LIMIT_MB = 0
+    MEMORY_REPORT_INTERVAL_MS = 5000
+    # Byte budget of the reference image cache used by portrait matching
+    SIMILARITY_CACHE_MB = 64
+    # Capture-only scans log ROI crops to disk and run OCR in a separate pass
+    CAPTURE_ONLY_MODE = False
+    # Click delay when a frame needs no analysis (captures and skipped characters)
+    CAPTURE_CLICK_DELAY = 0.5
+    FRAME_LOG_PORTRAIT_SCALE = 0.25
+    # Pause between scan steps
+    SCAN_STEP_INTERVAL_MS = 100
+    # Game instances scanned side by side by the session manager. Each entry has a
+    # "name" and optionally "origin" (instance top-left on the desktop, also the
+    # click offset), "click_offset", "output_dir", "selected_rarities", "capture_only"
+    SCAN_SESSIONS: list[dict] = []
+    # Formats streamed next to each JSON output: "csv", "ndjson", "sqlite"
+    EXPORT_FORMATS: list[str] = []
+    # Rows per SQLite export transaction
+    EXPORT_COMMIT_INTERVAL = 50
+    # Seconds the simulated game takes to show the next character and a popup
+    SIMULATOR_TRANSITION_DELAY = 0.3
+    SIMULATOR_POPUP_DELAY = 0.2
     CLICK_X = 1893
     CLICK_Y = 583
     LANGUAGE = "en"
     RARITY_ROI = (1569, 176, 1718, 253)
+    NAME_ROI = (1733, 234, 1863, 267)
+    PORTRAIT_ROI = (292, 118, 1439, 793)
+    BURST_ROI = (1635, 341, 1696, 400)
+    # dHash grid size per region and the bit distance still treated as the same frame
+    FINGERPRINT_HASH_SIZE = 8
+    FINGERPRINT_MAX_DISTANCE = 6
+    # Unchanged captures after which the next-character click is sent again
+    SCAN_UNCHANGED_RECLICK_FRAMES = 5
+    # SSIM window, coarse pyramid levels, and candidates refined at full resolution
+    SSIM_WIN_SIZE = 7
+    SSIM_PYRAMID_LEVELS = 3
+    SSIM_TOP_K = 5
+    # Initial cost estimates in seconds per identification step; refined while scanning
+    IDENTIFICATION_STEP_COSTS = {
+        "rarity": 0.0,
+        "burst": 0.01,
+        "portrait": 0.5,
+        "element": 2.5,
+        "weapon": 2.5,
+        "squad": 2.5,
+    }
+    IDENTIFICATION_COST_SMOOTHING = 0.3
+    # SSIM lead of the best portrait over the runner-up needed to settle a
+    # character without popup probes, and the initial share of matches clearing
+    # it (refined while scanning). At 0 the ranking only breaks ties after the
+    # probes; raise it once the margin is calibrated on real captures, using
+    # the margins the simulator reports
+    PORTRAIT_MATCH_MIN_MARGIN = 0.05
+    PORTRAIT_MATCH_ACCEPT_RATE = 0.0
     ATTRIBUTE_COORDS: dict[str, dict[str, dict[str, int]]] = {
         "SSR": {
             "element": {"x": 1617, "y": 639},
@@ -0,0 +1,56 @@
+import datetime
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+
+class ScanCheckpoint:
+    """Automation state persisted after every character so a scan can resume.
+
+    Writes go to a temporary file that is then swapped in, so a crash while
+    saving leaves the previous checkpoint intact.
+    """
+
+    def __init__(self, path: Path = Config.CHECKPOINT_FILE) -> None:
+        self.path = Path(path)
+
+    def save(self, state: Dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = dict(state)
+        payload["version"] = CHECKPOINT_VERSION
+        payload["saved_at"] = str(datetime.datetime.now())
+
+        temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(temp_path, "w") as f:
+            json.dump(payload, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        if not self.path.exists():
+            return None
+        try:
+            with open(self.path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return None
+        if state.get("version") != CHECKPOINT_VERSION:
+            return None
+        return state
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def clear(self) -> None:
+        if self.path.exists():
+            os.remove(self.path)
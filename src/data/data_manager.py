@@ -10,6 +10,7 @@ from PyQt5.QtCore import QObject, pyqtSignal
 from PyQt5.QtWidgets import QMessageBox, QProgressBar
 
 from src.config import Config
+from src.data.roster import RosterIndex
 from src.utils.localization import get_localized_text as _
 
 BASE_URL = "https://api.dotgg.gg/nikke"
@@ -27,7 +28,7 @@ class DataManager(QObject):
         self.config = config
         self.data_file = os.path.join(config.GENERATED_DATA_FILE)
         self.images_folder = os.path.join(config.GENERATED_DIR, "images")
-        self.nikke_data: List[Dict[str, Any]] = []
+        self.roster_index: Optional[RosterIndex] = None
 
     def check_and_update_data(self, parent_widget) -> bool:
         if not os.path.exists(self.data_file):
@@ -44,7 +45,7 @@ class DataManager(QObject):
             else:
                 return False
         else:
-            local_data = self.load_local_data()
+            local_data = self.get_roster_index()
             remote_characters = self.get_remote_characters()
 
             if self.data_needs_update(local_data, remote_characters):
@@ -61,24 +62,21 @@ class DataManager(QObject):
 
         return True
 
-    def load_local_data(self) -> List[Dict[str, Any]]:
-        with open(self.data_file, "r", encoding="utf-8") as f:
-            self.nikke_data = json.load(f)
-        return self.nikke_data
-
-    def get_nikke_data(self) -> List[Dict[str, Any]]:
-        if not self.nikke_data:
-            self.load_local_data()
-        return self.nikke_data
+    def get_roster_index(self) -> RosterIndex:
+        # Maps the compiled snapshot instead of parsing the JSON; the snapshot is
+        # rebuilt whenever nikke_data.json changes
+        if self.roster_index is None:
+            self.roster_index = RosterIndex.load(self.data_file)
+        return self.roster_index
 
     def get_remote_characters(self) -> List[Dict[str, Any]]:
         response = requests.get(f"{BASE_URL}/characters", headers=HEADERS)
         return response.json() if response.status_code == 200 else []
 
     def data_needs_update(
-        self, local_data: List[Dict[str, Any]], remote_characters: List[Dict[str, Any]]
+        self, local_data: RosterIndex, remote_characters: List[Dict[str, Any]]
     ) -> bool:
-        local_names = set(char["name"] for char in local_data)
+        local_names = set(local_data.names())
         remote_names = set(char["name"] for char in remote_characters)
         return local_names != remote_names
 
@@ -118,7 +116,7 @@ class DataManager(QObject):
         with open(self.data_file, "w", encoding="utf-8") as f:
             json.dump(processed_data, f, ensure_ascii=False, indent=2)
 
-        self.nikke_data = processed_data
+        self.roster_index = None
 
         progress_bar.hide()
         QMessageBox.information(
@@ -1,21 +1,88 @@
 import datetime
 import json
 import os
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from src.config import Config
+from src.data.export import ResultExporter
+from src.data.history import ScanHistory
 
 
 class NikkeDatabase:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        data_folder: Optional[Path] = None,
+        export_formats: Optional[List[str]] = None,
+    ) -> None:
         self.config: Config = Config()
-        self.data_folder: str = str(self.config.USER_DATA_DIR)
+        self.data_folder: str = str(data_folder or self.config.USER_DATA_DIR)
         self.current_file: str = self._generate_new_filename()
         self.data: List[Dict[str, Any]] = []
 
+        self.history: ScanHistory = ScanHistory(
+            Path(self.data_folder) / self.config.HISTORY_DB_FILE.name
+        )
+        if not self.history.is_json_import_done():
+            self.history.import_json_outputs(Path(self.data_folder))
+        # Started with the first result, so runs that store nothing leave no session
+        self.session_id: Optional[int] = None
+
+        self.export_formats: List[str] = (
+            self.config.EXPORT_FORMATS if export_formats is None else export_formats
+        )
+        # Opened with the first result, so runs that store nothing leave no files
+        self.exporter: Optional[ResultExporter] = None
+
+    def _export(self, record: Dict[str, Any]) -> None:
+        if not self.export_formats:
+            return
+        if self.exporter is None:
+            # ``record`` is already in ``data``, which reopening writes out
+            self._open_exports()
+        else:
+            self.exporter.write(record)
+
+    def _open_exports(self) -> None:
+        # Exports sit next to the JSON output, e.g. nikke_ocr_<timestamp>.csv
+        base = os.path.splitext(self.current_file)[0]
+        self.exporter = ResultExporter(Path(base), self.export_formats)
+        for record in self.data:
+            self.exporter.write(record)
+
+    def finish_scan(self) -> None:
+        """Finalizes the exports once a scan completes or is stopped.
+
+        A later scan into the same output file reopens them with every result.
+        """
+        if self.exporter is not None:
+            self.exporter.finalize()
+            self.exporter = None
+
     def _generate_new_filename(self) -> str:
         timestamp = datetime.datetime.now().strftime("%Y_%m_%d_%H_%M_%S")
-        return str(self.config.get_user_data_file(timestamp))
+        filename = self.config.get_user_data_file(timestamp).name
+        return os.path.join(self.data_folder, filename)
+
+    def resume(
+        self,
+        current_file: str,
+        data: List[Dict[str, Any]],
+        session_id: Optional[int] = None,
+    ) -> None:
+        """Continues writing to the output file and history session of an earlier run."""
+        self.current_file = current_file
+        self.data = data
+        if self.exporter is not None:
+            self.exporter.abort()
+            self.exporter = None
+        # The interrupted run never finalized its exports; rewrite them
+        if data and self.export_formats:
+            self._open_exports()
+        if session_id is not None and session_id != self.session_id:
+            if self.session_id is not None:
+                self.history.discard_session_if_empty(self.session_id)
+            self.session_id = session_id
 
     def load_data(self) -> List[Dict[str, Any]]:
         if os.path.exists(self.current_file):
@@ -50,6 +117,12 @@ class NikkeDatabase:
         else:
             self.data.append(simplified_info)
 
+        if self.session_id is None:
+            self.session_id = self.history.start_session(
+                source=os.path.basename(self.current_file)
+            )
+        self.history.record(self.session_id, simplified_info)
+        self._export(simplified_info)
         self.save_data()
         return True
 
@@ -64,3 +137,4 @@ class NikkeDatabase:
 
     def close(self) -> None:
         self.save_data()
+        self.history.close()
@@ -0,0 +1,282 @@
+import csv
+import io
+import json
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+from src.config import Config
+
+# Columns of a scan result, as stored by NikkeDatabase.add_or_update_character
+EXPORT_FIELDS = [
+    "name",
+    "manufacturer",
+    "squad",
+    "class",
+    "burst",
+    "rarity",
+    "weapon",
+    "element",
+    "combat_power",
+    "last_updated",
+]
+# Merged exports prefix each row with the account it was scanned from
+MERGED_EXPORT_FIELDS = ["account"] + EXPORT_FIELDS
+
+
+def _text(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+class StreamExporter(ABC):
+    """Writes scan results to one file as they arrive.
+
+    Rows go to ``<path>.partial`` and are flushed on every write; nothing but
+    the keys seen so far is kept in memory. ``finalize`` moves the finished
+    file into place with ``os.replace``, so readers never see a partial
+    export. A character written again replaces its earlier row.
+    """
+
+    suffix = ""
+
+    def __init__(self, path: Path, fields: Sequence[str] = EXPORT_FIELDS) -> None:
+        self.path = Path(path)
+        self.temp_path = self.path.with_name(self.path.name + ".partial")
+        self.fields = list(fields)
+        self.count = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def key(self, record: Dict[str, Any]) -> Tuple[Any, ...]:
+        return (record.get("account"), record.get("name"))
+
+    @abstractmethod
+    def write(self, record: Dict[str, Any]) -> None:
+        """Appends ``record``, replacing an earlier row for the same character."""
+
+    @abstractmethod
+    def finalize(self) -> Path:
+        """Completes the file, moves it into place and returns its path."""
+
+    @abstractmethod
+    def abort(self) -> None:
+        """Discards the partial file."""
+
+
+class LineExporter(StreamExporter):
+    """Base for text formats with one record per line."""
+
+    header = False
+
+    def __init__(self, path: Path, fields: Sequence[str] = EXPORT_FIELDS) -> None:
+        super().__init__(path, fields)
+        self.keys: set = set()
+        self.replaced = 0
+        self.file = open(self.temp_path, "w", encoding="utf-8", newline="")
+        if self.header:
+            self.file.write(self.encode(dict(zip(self.fields, self.fields))))
+
+    @abstractmethod
+    def encode(self, record: Dict[str, Any]) -> str:
+        """One line of the file, including its line terminator."""
+
+    @abstractmethod
+    def decode(self, line: str) -> Dict[str, Any]:
+        pass
+
+    def write(self, record: Dict[str, Any]) -> None:
+        key = self.key(record)
+        if key in self.keys:
+            self.replaced += 1
+        self.keys.add(key)
+        self.file.write(self.encode(record))
+        self.file.flush()
+        self.count += 1
+
+    def _compact(self) -> None:
+        """Drops rows that a later row for the same character replaced."""
+        last: Dict[Tuple[Any, ...], int] = {}
+        with open(self.temp_path, "r", encoding="utf-8", newline="") as f:
+            for number, line in enumerate(f):
+                if number or not self.header:
+                    last[self.key(self.decode(line))] = number
+
+        keep = set(last.values())
+        compacted = self.temp_path.with_name(self.temp_path.name + ".compact")
+        with open(self.temp_path, "r", encoding="utf-8", newline="") as source:
+            with open(compacted, "w", encoding="utf-8", newline="") as target:
+                for number, line in enumerate(source):
+                    if number in keep or (number == 0 and self.header):
+                        target.write(line)
+        os.replace(compacted, self.temp_path)
+
+    def finalize(self) -> Path:
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        if self.replaced:
+            self._compact()
+        os.replace(self.temp_path, self.path)
+        return self.path
+
+    def abort(self) -> None:
+        self.file.close()
+        self.temp_path.unlink(missing_ok=True)
+
+
+class CSVExporter(LineExporter):
+    suffix = ".csv"
+    header = True
+
+    def encode(self, record: Dict[str, Any]) -> str:
+        line = io.StringIO()
+        csv.writer(line).writerow([_text(record.get(f)) or "" for f in self.fields])
+        return line.getvalue()
+
+    def decode(self, line: str) -> Dict[str, Any]:
+        return dict(zip(self.fields, next(csv.reader([line]))))
+
+    def key(self, record: Dict[str, Any]) -> Tuple[Any, ...]:
+        # CSV has no null; compare keys the way they read back
+        return tuple(_text(v) or "" for v in super().key(record))
+
+
+class NDJSONExporter(LineExporter):
+    suffix = ".ndjson"
+
+    def encode(self, record: Dict[str, Any]) -> str:
+        row = {field: record.get(field) for field in self.fields}
+        return json.dumps(row, ensure_ascii=False) + "\n"
+
+    def decode(self, line: str) -> Dict[str, Any]:
+        return json.loads(line)
+
+
+class SQLiteExporter(StreamExporter):
+    suffix = ".sqlite3"
+
+    def __init__(
+        self,
+        path: Path,
+        fields: Sequence[str] = EXPORT_FIELDS,
+        commit_interval: int = Config.EXPORT_COMMIT_INTERVAL,
+    ) -> None:
+        super().__init__(path, fields)
+        self.commit_interval = max(1, commit_interval)
+        self.temp_path.unlink(missing_ok=True)
+        self.connection = sqlite3.connect(str(self.temp_path))
+        names = [f'"{f}"' for f in self.fields]
+        key_columns = [f'"{f}"' for f in self.fields if f in ("account", "name")]
+        # Merged exports key on (account, name); NULLs would not collide in the key
+        columns = [
+            f"{name} TEXT NOT NULL DEFAULT ''" if f == "account" else f"{name} TEXT"
+            for f, name in zip(self.fields, names)
+        ]
+        self.connection.execute(
+            f"CREATE TABLE results ({', '.join(columns)},"
+            f" PRIMARY KEY ({', '.join(key_columns)}))"
+        )
+        self.insert = (
+            f"INSERT OR REPLACE INTO results ({', '.join(names)})"
+            f" VALUES ({', '.join('?' for _ in names)})"
+        )
+
+    def write(self, record: Dict[str, Any]) -> None:
+        values = [_text(record.get(f)) for f in self.fields]
+        if "account" in self.fields:
+            values[self.fields.index("account")] = record.get("account") or ""
+        self.connection.execute(self.insert, values)
+        self.count += 1
+        if self.count % self.commit_interval == 0:
+            self.connection.commit()
+
+    def finalize(self) -> Path:
+        self.connection.commit()
+        self.connection.close()
+        os.replace(self.temp_path, self.path)
+        return self.path
+
+    def abort(self) -> None:
+        self.connection.close()
+        self.temp_path.unlink(missing_ok=True)
+
+
+EXPORTERS: Dict[str, Type[StreamExporter]] = {
+    "csv": CSVExporter,
+    "ndjson": NDJSONExporter,
+    "sqlite": SQLiteExporter,
+}
+
+
+class ResultExporter:
+    """Streams every result to one file per format, named ``<base><suffix>``."""
+
+    def __init__(
+        self,
+        base: Path,
+        formats: Iterable[str],
+        fields: Sequence[str] = EXPORT_FIELDS,
+    ) -> None:
+        self.exporters: List[StreamExporter] = []
+        for name in formats:
+            if name not in EXPORTERS:
+                raise ValueError(
+                    f"Unknown export format '{name}', expected one of {sorted(EXPORTERS)}"
+                )
+            exporter_class = EXPORTERS[name]
+            path = Path(base).with_name(Path(base).name + exporter_class.suffix)
+            self.exporters.append(exporter_class(path, fields))
+
+    def write(self, record: Dict[str, Any]) -> None:
+        for exporter in self.exporters:
+            exporter.write(record)
+
+    def finalize(self) -> List[Path]:
+        return [exporter.finalize() for exporter in self.exporters]
+
+    def abort(self) -> None:
+        for exporter in self.exporters:
+            exporter.abort()
+
+
+def merge_exports(
+    sources: Iterable[Path],
+    base: Path,
+    formats: Optional[Iterable[str]] = None,
+) -> List[Path]:
+    """Combines JSON scan outputs of several accounts into one export per format.
+
+    Sources are read one at a time, so memory is bounded by the largest
+    single output rather than the merged total. The account column is the
+    source file name without its extension.
+    """
+    exporter = ResultExporter(
+        base, formats or list(EXPORTERS), fields=MERGED_EXPORT_FIELDS
+    )
+    try:
+        for source in sources:
+            source = Path(source)
+            with open(source, "r", encoding="utf-8") as f:
+                records = json.load(f)
+            for record in records:
+                exporter.write(dict(record, account=source.stem))
+    except BaseException:
+        exporter.abort()
+        raise
+    return exporter.finalize()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Merge JSON scan outputs into CSV, NDJSON and SQLite exports."
+    )
+    parser.add_argument("output", type=Path, help="output path without extension")
+    parser.add_argument("sources", type=Path, nargs="+")
+    parser.add_argument("--formats", default=",".join(EXPORTERS))
+    args = parser.parse_args()
+
+    for path in merge_exports(args.sources, args.output, args.formats.split(",")):
+        print(path)
@@ -0,0 +1,189 @@
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from src.config import Config
+from src.utils.fingerprint import crop
+
+MAGIC = b"NIKKEFRM"
+VERSION = 1
+# magic, version, record size, record count
+HEADER = struct.Struct("<8sIII")
+HEADER_SIZE = 64
+GROWTH_RECORDS = 64
+
+
+def _roi_shape(roi: Tuple[int, int, int, int]) -> Tuple[int, int, int]:
+    left, top, right, bottom = roi
+    return (bottom - top, right - left, 3)
+
+
+def _cp_roi(rarity: str) -> Tuple[int, int, int, int]:
+    cp = Config.ATTRIBUTE_COORDS[rarity]["cp"]
+    return (cp["left"], cp["top"], cp["right"], cp["bottom"])
+
+
+def _portrait_size() -> Tuple[int, int]:
+    left, top, right, bottom = Config.PORTRAIT_ROI
+    scale = Config.FRAME_LOG_PORTRAIT_SCALE
+    return (int((right - left) * scale), int((bottom - top) * scale))
+
+
+def record_dtype() -> np.dtype:
+    """Layout of one captured frame: only the ROIs the analysis pass reads."""
+    portrait_width, portrait_height = _portrait_size()
+    fingerprint_bytes = 2 * Config.FINGERPRINT_HASH_SIZE**2 // 8
+    return np.dtype(
+        [
+            ("index", "<u4"),
+            ("timestamp", "<f8"),
+            ("fingerprint", "u1", (fingerprint_bytes,)),
+            ("rarity", "u1", _roi_shape(Config.RARITY_ROI)),
+            ("name", "u1", _roi_shape(Config.NAME_ROI)),
+            ("cp_sr", "u1", _roi_shape(_cp_roi("SR"))),
+            ("cp_r", "u1", _roi_shape(_cp_roi("R"))),
+            ("burst", "u1", _roi_shape(Config.BURST_ROI)),
+            ("portrait", "u1", (portrait_height, portrait_width, 3)),
+        ],
+        align=True,
+    )
+
+
+def extract_rois(screenshot: np.ndarray) -> Dict[str, np.ndarray]:
+    left, top, right, bottom = Config.PORTRAIT_ROI
+    portrait = cv2.resize(
+        screenshot[top:bottom, left:right],
+        _portrait_size(),
+        interpolation=cv2.INTER_AREA,
+    )
+    return {
+        "rarity": crop(screenshot, Config.RARITY_ROI),
+        "name": crop(screenshot, Config.NAME_ROI),
+        "cp_sr": crop(screenshot, _cp_roi("SR")),
+        "cp_r": crop(screenshot, _cp_roi("R")),
+        "burst": crop(screenshot, Config.BURST_ROI),
+        "portrait": portrait,
+    }
+
+
+class FrameLog:
+    """Append-only, memory-mapped log of fixed-size ROI records.
+
+    The file is a 64 byte header followed by records of ``record_dtype()``;
+    it grows in chunks and is remapped when full, so appends are plain
+    memory copies.
+    """
+
+    def __init__(self, path: Path, readonly: bool = False) -> None:
+        self.path = Path(path)
+        self.readonly = readonly
+        self.dtype = record_dtype()
+        self.count = 0
+        self._records: Optional[np.memmap] = None
+
+        if self.path.exists():
+            with open(self.path, "rb") as f:
+                magic, version, record_size, count = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{self.path} is not a frame log")
+            if record_size != self.dtype.itemsize:
+                raise ValueError(
+                    f"{self.path} was captured with a different ROI layout"
+                )
+            self.count = count
+        elif readonly:
+            raise FileNotFoundError(self.path)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, VERSION, self.dtype.itemsize, 0))
+                f.truncate(HEADER_SIZE)
+
+        self._map()
+
+    @property
+    def capacity(self) -> int:
+        return (os.path.getsize(self.path) - HEADER_SIZE) // self.dtype.itemsize
+
+    def _map(self) -> None:
+        self._map_release()
+        capacity = self.capacity
+        if capacity == 0:
+            return
+        self._records = np.memmap(
+            self.path,
+            dtype=self.dtype,
+            mode="r" if self.readonly else "r+",
+            offset=HEADER_SIZE,
+            shape=(capacity,),
+        )
+
+    def _grow(self) -> None:
+        self._map_release()
+        with open(self.path, "r+b") as f:
+            f.truncate(
+                HEADER_SIZE + (self.capacity + GROWTH_RECORDS) * self.dtype.itemsize
+            )
+        self._map()
+
+    def _map_release(self) -> None:
+        if self._records is not None:
+            self._records.flush()
+            self._records = None
+
+    def _write_count(self) -> None:
+        with open(self.path, "r+b") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.dtype.itemsize, self.count))
+
+    def append(self, screenshot: np.ndarray, fingerprint: int) -> int:
+        if self.readonly:
+            raise PermissionError(f"{self.path} is opened read-only")
+        if self.count >= self.capacity:
+            self._grow()
+
+        record = self._records[self.count]
+        record["index"] = self.count
+        record["timestamp"] = time.time()
+        size = self.dtype["fingerprint"].shape[0]
+        record["fingerprint"] = np.frombuffer(
+            fingerprint.to_bytes(size, "big"), dtype=np.uint8
+        )
+        for field, roi in extract_rois(screenshot).items():
+            record[field] = roi
+
+        self.count += 1
+        self._write_count()
+        return self.count - 1
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> np.void:
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return self._records[index]
+
+    def __iter__(self) -> Iterator[np.void]:
+        for index in range(self.count):
+            yield self._records[index]
+
+    def fingerprints(self) -> List[int]:
+        return [
+            int.from_bytes(record["fingerprint"].tobytes(), "big") for record in self
+        ]
+
+    def flush(self) -> None:
+        if self._records is not None:
+            self._records.flush()
+
+    def close(self) -> None:
+        self._map_release()
+        if not self.readonly:
+            # Drop unused preallocated records
+            with open(self.path, "r+b") as f:
+                f.truncate(HEADER_SIZE + self.count * self.dtype.itemsize)
@@ -0,0 +1,247 @@
+import datetime
+import json
+import logging
+import re
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    source TEXT
+);
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    name TEXT NOT NULL,
+    manufacturer TEXT,
+    squad TEXT,
+    class TEXT,
+    burst TEXT,
+    rarity TEXT,
+    weapon TEXT,
+    element TEXT,
+    combat_power INTEGER,
+    combat_power_text TEXT,
+    recorded_at TEXT NOT NULL,
+    UNIQUE (session_id, name)
+);
+CREATE INDEX IF NOT EXISTS idx_scans_name_time ON scans (name, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_scans_time ON scans (recorded_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_started ON sessions (started_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_source ON sessions (source);
+"""
+
+CHARACTER_FIELDS = [
+    "manufacturer",
+    "squad",
+    "class",
+    "burst",
+    "rarity",
+    "weapon",
+    "element",
+]
+
+JSON_FILENAME_PATTERN = re.compile(r"nikke_ocr_(\d{4}(?:_\d{2}){5})\.json$")
+
+
+def parse_combat_power(value: Any) -> Optional[int]:
+    """OCR reads CP as text such as '12,345'; keep only the digits."""
+    if value is None:
+        return None
+    digits = re.sub(r"\D", "", str(value))
+    return int(digits) if digits else None
+
+
+class ScanHistory:
+    """SQLite store of every scan session, indexed by character name and time."""
+
+    def __init__(self, db_file: Path = Config.HISTORY_DB_FILE) -> None:
+        Path(db_file).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(db_file))
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+        self.connection.commit()
+
+    def start_session(
+        self, started_at: Optional[str] = None, source: Optional[str] = None
+    ) -> int:
+        started_at = started_at or datetime.datetime.now().isoformat(sep=" ")
+        cursor = self.connection.execute(
+            "INSERT INTO sessions (started_at, source) VALUES (?, ?)",
+            (started_at, source),
+        )
+        self.connection.commit()
+        return int(cursor.lastrowid)
+
+    def discard_session_if_empty(self, session_id: int) -> None:
+        with self.connection:
+            self.connection.execute(
+                """
+                DELETE FROM sessions WHERE id = ?
+                AND NOT EXISTS (SELECT 1 FROM scans WHERE session_id = ?)
+                """,
+                (session_id, session_id),
+            )
+
+    def record(
+        self, session_id: int, info: Dict[str, Any], commit: bool = True
+    ) -> None:
+        recorded_at = info.get("last_updated") or str(datetime.datetime.now())
+        cp_text = info.get("combat_power")
+        self.connection.execute(
+            f"""
+            INSERT INTO scans (session_id, name, {", ".join(CHARACTER_FIELDS)},
+                               combat_power, combat_power_text, recorded_at)
+            VALUES (?, ?, {", ".join("?" for _ in CHARACTER_FIELDS)}, ?, ?, ?)
+            ON CONFLICT (session_id, name) DO UPDATE SET
+                {", ".join(f"{f} = excluded.{f}" for f in CHARACTER_FIELDS)},
+                combat_power = excluded.combat_power,
+                combat_power_text = excluded.combat_power_text,
+                recorded_at = excluded.recorded_at
+            """,
+            (
+                session_id,
+                info["name"],
+                *[info.get(field) for field in CHARACTER_FIELDS],
+                parse_combat_power(cp_text),
+                None if cp_text is None else str(cp_text),
+                recorded_at,
+            ),
+        )
+        if commit:
+            self.connection.commit()
+
+    def get_sessions(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        rows = self.connection.execute(
+            """
+            SELECT s.id, s.started_at, s.source, COUNT(c.id) AS characters
+            FROM sessions s LEFT JOIN scans c ON c.session_id = s.id
+            GROUP BY s.id ORDER BY s.started_at DESC LIMIT ?
+            """,
+            (-1 if limit is None else limit,),
+        )
+        return [dict(row) for row in rows]
+
+    def latest_per_character(self) -> List[Dict[str, Any]]:
+        rows = self.connection.execute("""
+            SELECT c.* FROM scans c
+            JOIN (
+                SELECT name, MAX(recorded_at) AS recorded_at FROM scans GROUP BY name
+            ) latest ON latest.name = c.name AND latest.recorded_at = c.recorded_at
+            ORDER BY c.name
+            """)
+        return [dict(row) for row in rows]
+
+    def cp_series(
+        self, name: str, limit: Optional[int] = None
+    ) -> List[Tuple[str, Optional[int]]]:
+        """Most recent ``limit`` CP readings of ``name``, oldest first."""
+        rows = self.connection.execute(
+            """
+            SELECT recorded_at, combat_power FROM scans
+            WHERE name = ? ORDER BY recorded_at DESC LIMIT ?
+            """,
+            (name, -1 if limit is None else limit),
+        ).fetchall()
+        return [(row["recorded_at"], row["combat_power"]) for row in reversed(rows)]
+
+    def diff_sessions(self, old_session: int, new_session: int) -> List[Dict[str, Any]]:
+        old = self._session_cp(old_session)
+        new = self._session_cp(new_session)
+        changes: List[Dict[str, Any]] = []
+        for name in sorted(old.keys() | new.keys()):
+            old_cp, new_cp = old.get(name), new.get(name)
+            if name not in old:
+                status = "added"
+            elif name not in new:
+                status = "removed"
+            elif old_cp != new_cp:
+                status = "changed"
+            else:
+                continue
+            delta = (
+                new_cp - old_cp if old_cp is not None and new_cp is not None else None
+            )
+            changes.append(
+                {
+                    "name": name,
+                    "status": status,
+                    "old_combat_power": old_cp,
+                    "new_combat_power": new_cp,
+                    "delta": delta,
+                }
+            )
+        return changes
+
+    def _session_cp(self, session_id: int) -> Dict[str, Optional[int]]:
+        rows = self.connection.execute(
+            "SELECT name, combat_power FROM scans WHERE session_id = ?", (session_id,)
+        )
+        return {row["name"]: row["combat_power"] for row in rows}
+
+    def is_json_import_done(self) -> bool:
+        row = self.connection.execute(
+            "SELECT value FROM meta WHERE key = 'json_import_done'"
+        ).fetchone()
+        return row is not None
+
+    def import_json_outputs(
+        self, directory: Path = Config.USER_DATA_DIR, exclude: Optional[str] = None
+    ) -> int:
+        """Migrates timestamped ``nikke_ocr_*.json`` outputs; returns sessions added.
+
+        Files already imported are skipped, so this is safe to run again.
+        """
+        imported = 0
+        for path in sorted(Path(directory).glob("nikke_ocr_*.json")):
+            match = JSON_FILENAME_PATTERN.search(path.name)
+            if not match or str(path) == exclude:
+                continue
+            already = self.connection.execute(
+                "SELECT 1 FROM sessions WHERE source = ?", (path.name,)
+            ).fetchone()
+            if already:
+                continue
+
+            try:
+                with open(path, "r") as f:
+                    characters = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable scan output {path}: {e}")
+                continue
+
+            started_at = str(
+                datetime.datetime.strptime(match.group(1), "%Y_%m_%d_%H_%M_%S")
+            )
+            with self.connection:
+                cursor = self.connection.execute(
+                    "INSERT INTO sessions (started_at, source) VALUES (?, ?)",
+                    (started_at, path.name),
+                )
+                for info in characters:
+                    if info.get("name"):
+                        info.setdefault("last_updated", started_at)
+                        self.record(int(cursor.lastrowid), info, commit=False)
+            imported += 1
+
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('json_import_done', ?)",
+                (str(datetime.datetime.now()),),
+            )
+        return imported
+
+    def close(self) -> None:
+        self.connection.close()
@@ -0,0 +1,240 @@
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+# Compiled roster snapshot stored next to nikke_data.json: a 64-byte header,
+# one uint32 column of string ids per field, then a sorted string table
+# (uint32 offsets followed by the UTF-8 bytes). Rows are sorted by lowercase
+# name, so the "lookup" column is sorted and name lookups are binary searches.
+SNAPSHOT_MAGIC = b"NIKKERST"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = ".roster"
+# magic, version, field count, rows, strings, source mtime (ns), source size
+HEADER = struct.Struct("<8sIIIIqq")
+HEADER_SIZE = 64
+SNAPSHOT_FIELDS = (
+    "lookup",
+    "name",
+    "manufacturer",
+    "squad",
+    "class",
+    "burst",
+    "rarity",
+    "weapon",
+    "element",
+    "image",
+)
+MISSING = 0xFFFFFFFF
+
+
+def _field_value(nikke: Dict[str, Any], field: str) -> Optional[str]:
+    if field == "lookup":
+        value = nikke["name"].lower()
+    elif field == "image":
+        value = (nikke.get("images") or {}).get("big")
+    else:
+        value = nikke.get(field)
+    return None if value is None else str(value)
+
+
+def compile_snapshot(
+    nikke_data: List[Dict[str, Any]], source_mtime_ns: int = 0, source_size: int = 0
+) -> bytes:
+    """Encodes the scan-relevant fields of the roster as a snapshot."""
+    records = sorted(nikke_data, key=lambda nikke: nikke["name"].lower())
+    values = [[_field_value(n, field) for n in records] for field in SNAPSHOT_FIELDS]
+    strings = sorted(
+        {v.encode("utf-8") for column in values for v in column if v is not None}
+    )
+    ids = {string: i for i, string in enumerate(strings)}
+
+    columns = np.array(
+        [
+            [MISSING if v is None else ids[v.encode("utf-8")] for v in column]
+            for column in values
+        ],
+        dtype="<u4",
+    ).reshape(len(SNAPSHOT_FIELDS), len(records))
+    offsets = np.zeros(len(strings) + 1, dtype="<u4")
+    offsets[1:] = np.cumsum([len(string) for string in strings])
+
+    header = HEADER.pack(
+        SNAPSHOT_MAGIC,
+        SNAPSHOT_VERSION,
+        len(SNAPSHOT_FIELDS),
+        len(records),
+        len(strings),
+        source_mtime_ns,
+        source_size,
+    )
+    return b"".join(
+        [
+            header.ljust(HEADER_SIZE, b"\0"),
+            columns.tobytes(),
+            offsets.tobytes(),
+            *strings,
+        ]
+    )
+
+
+def snapshot_path(data_file: Path) -> Path:
+    return Path(data_file).with_suffix(SNAPSHOT_SUFFIX)
+
+
+def build_snapshot(data_file: Path, snapshot_file: Optional[Path] = None) -> bytes:
+    """Compiles ``data_file`` and writes the snapshot atomically; returns its bytes."""
+    data_file = Path(data_file)
+    snapshot_file = Path(snapshot_file or snapshot_path(data_file))
+    stat = data_file.stat()
+    with open(data_file, "r", encoding="utf-8") as f:
+        snapshot = compile_snapshot(json.load(f), stat.st_mtime_ns, stat.st_size)
+
+    temp_file = snapshot_file.with_name(f"{snapshot_file.name}.{os.getpid()}.tmp")
+    with open(temp_file, "wb") as f:
+        f.write(snapshot)
+    try:
+        os.replace(temp_file, snapshot_file)
+    except OSError:
+        # Another process still maps the old snapshot; it is rebuilt next time
+        os.remove(temp_file)
+    return snapshot
+
+
+class RosterIndex:
+    """Read-only lookup structure over a compiled roster snapshot.
+
+    Load time and resident memory do not depend on the roster size: the
+    snapshot is memory-mapped and character dicts are built only for the rows
+    a lookup returns. Safe to share between scan sessions; callers get fresh
+    dicts they may annotate.
+    """
+
+    def __init__(self, buffer: Union[bytes, np.ndarray]) -> None:
+        (
+            magic,
+            version,
+            field_count,
+            rows,
+            string_count,
+            self.source_mtime_ns,
+            self.source_size,
+        ) = HEADER.unpack_from(buffer, 0)
+        if (
+            magic != SNAPSHOT_MAGIC
+            or version != SNAPSHOT_VERSION
+            or field_count != len(SNAPSHOT_FIELDS)
+        ):
+            raise ValueError("Unsupported roster snapshot")
+
+        self.buffer = buffer
+        offset = HEADER_SIZE
+        self.columns = np.frombuffer(
+            buffer, dtype="<u4", count=field_count * rows, offset=offset
+        ).reshape(field_count, rows)
+        offset += self.columns.nbytes
+        self.offsets = np.frombuffer(
+            buffer, dtype="<u4", count=string_count + 1, offset=offset
+        )
+        offset += self.offsets.nbytes
+        self.strings = np.frombuffer(buffer, dtype=np.uint8, offset=offset)
+
+    @classmethod
+    def from_records(cls, nikke_data: List[Dict[str, Any]]) -> "RosterIndex":
+        return cls(compile_snapshot(nikke_data))
+
+    @classmethod
+    def load(cls, data_file: Path) -> "RosterIndex":
+        """Maps the snapshot of ``data_file``, rebuilding it if the JSON changed."""
+        data_file = Path(data_file)
+        snapshot_file = snapshot_path(data_file)
+        stat = data_file.stat()
+        if cls._is_current(snapshot_file, stat.st_mtime_ns, stat.st_size):
+            return cls(np.memmap(snapshot_file, dtype=np.uint8, mode="r"))
+
+        snapshot = build_snapshot(data_file, snapshot_file)
+        if cls._is_current(snapshot_file, stat.st_mtime_ns, stat.st_size):
+            return cls(np.memmap(snapshot_file, dtype=np.uint8, mode="r"))
+        return cls(snapshot)
+
+    @staticmethod
+    def _is_current(snapshot_file: Path, mtime_ns: int, size: int) -> bool:
+        try:
+            with open(snapshot_file, "rb") as f:
+                header = HEADER.unpack(f.read(HEADER.size))
+        except (OSError, struct.error):
+            return False
+        magic, version, field_count, _, _, source_mtime_ns, source_size = header
+        return (magic, version, field_count, source_mtime_ns, source_size) == (
+            SNAPSHOT_MAGIC,
+            SNAPSHOT_VERSION,
+            len(SNAPSHOT_FIELDS),
+            mtime_ns,
+            size,
+        )
+
+    def _string(self, string_id: int) -> Optional[str]:
+        if string_id == MISSING:
+            return None
+        start, end = self.offsets[string_id], self.offsets[string_id + 1]
+        return self.strings[start:end].tobytes().decode("utf-8")
+
+    def _string_id(self, value: str) -> Optional[int]:
+        target = value.encode("utf-8")
+        low, high = 0, len(self.offsets) - 1
+        while low < high:
+            middle = (low + high) // 2
+            start, end = self.offsets[middle], self.offsets[middle + 1]
+            if self.strings[start:end].tobytes() < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self.offsets) - 1 and self._string(low) == value:
+            return low
+        return None
+
+    def row(self, index: int) -> Dict[str, Any]:
+        values = {
+            field: self._string(self.columns[i, index])
+            for i, field in enumerate(SNAPSHOT_FIELDS)
+        }
+        del values["lookup"]
+        values["images"] = {"big": values.pop("image")}
+        return values
+
+    def rows(self, indices: Any) -> List[Dict[str, Any]]:
+        return [self.row(int(i)) for i in indices]
+
+    def all(self) -> List[Dict[str, Any]]:
+        return self.rows(range(len(self)))
+
+    def names(self) -> List[Optional[str]]:
+        name_column = SNAPSHOT_FIELDS.index("name")
+        return [self._string(i) for i in self.columns[name_column]]
+
+    def find_by_name(self, name: str) -> List[Dict[str, Any]]:
+        string_id = self._string_id(name.lower())
+        if string_id is None:
+            return []
+        lookup = self.columns[0]
+        start = np.searchsorted(lookup, string_id, side="left")
+        end = np.searchsorted(lookup, string_id, side="right")
+        return self.rows(range(start, end))
+
+    def where(self, field: str, value: str) -> List[Dict[str, Any]]:
+        """Rows whose ``field`` equals ``value``."""
+        string_id = self._string_id(str(value))
+        if string_id is None:
+            return []
+        column = self.columns[SNAPSHOT_FIELDS.index(field)]
+        return self.rows(np.flatnonzero(column == string_id))
+
+    def memory_bytes(self) -> int:
+        # For a mapped snapshot this is the mapping size; pages load on access
+        return self.columns.nbytes + self.offsets.nbytes + self.strings.nbytes
+
+    def __len__(self) -> int:
+        return self.columns.shape[1]
@@ -0,0 +1,33 @@
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtWidgets import QTextEdit
+
+from src.config import Config
+from src.utils.log_sink import configure_logging, drain_ui_messages
+
+
+class UILogSink(QObject):
+    """Flushes buffered log messages into a text widget in batches on a timer."""
+
+    def __init__(
+        self,
+        widget: QTextEdit,
+        interval_ms: int = Config.LOG_FLUSH_INTERVAL_MS,
+        max_lines: int = Config.LOG_MAX_LINES,
+    ) -> None:
+        super().__init__(widget)
+        configure_logging()
+        self.widget = widget
+        self.widget.document().setMaximumBlockCount(max_lines)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.flush)
+        self.timer.start(interval_ms)
+
+    def flush(self) -> None:
+        messages = drain_ui_messages()
+        if messages:
+            self.widget.append("\n".join(messages))
+
+    def stop(self) -> None:
+        self.timer.stop()
+        self.flush()
@@ -1,9 +1,7 @@
 import logging
-from typing import Any, Dict, List, Optional, Tuple, Union
+import threading
+from typing import Any, Dict, List, Optional, Union
 
-import cv2
-import numpy as np
-import pyautogui
 from pynput import keyboard
 from pynput.keyboard import Key, KeyCode
 from PyQt5.QtCore import QObject, Qt, QTimer, pyqtSignal, pyqtSlot
@@ -13,6 +11,7 @@ from PyQt5.QtWidgets import (
     QActionGroup,
     QCheckBox,
     QComboBox,
+    QFileDialog,
     QHBoxLayout,
     QLabel,
     QMainWindow,
@@ -26,17 +25,19 @@ from PyQt5.QtWidgets import (
     QWidget,
 )
 
-from src.automation.click_sequence import ClickAutomation
+from src.automation.frame_analysis import analyze_frame_log
+from src.automation.scanner import Scanner
 from src.config import Config
+from src.data.checkpoint import ScanCheckpoint
 from src.data.data_manager import DataManager
 from src.data.database import NikkeDatabase
+from src.data.roster import RosterIndex
+from src.gui.log_view import UILogSink
 from src.utils.image_processor import ImageProcessor
 from src.utils.localization import get_localized_text as _
 from src.utils.localization import set_language
+from src.utils.memory import MemoryMonitor
 
-logging.basicConfig(
-    level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s"
-)
 logger = logging.getLogger(__name__)
 
 
@@ -62,17 +63,33 @@ class NikkeOCRUI(QMainWindow):
         self.data_manager: DataManager = DataManager(self.config)
         self.image_processor: ImageProcessor = ImageProcessor()
         self.database: NikkeDatabase = NikkeDatabase()
-        self.click_sequence: ClickAutomation = ClickAutomation()
+        self.checkpoint: ScanCheckpoint = ScanCheckpoint(self.config.CHECKPOINT_FILE)
 
         self.automation_active: bool = False
-        self.first_nikke_name: Optional[str] = None
-        self.processed_nikkes: int = 0
-        self.current_step: int = 0
         self.selected_rarities: List[str] = ["SSR", "SR", "R"]
+        self.capture_only: bool = Config.CAPTURE_ONLY_MODE
+        # The roster is attached when a scan starts, after the data check
+        self.scanner: Scanner = Scanner(
+            self.image_processor,
+            RosterIndex.from_records([]),
+            self.database,
+            checkpoint=self.checkpoint,
+            log=self.log,
+        )
+        self.memory_monitor: MemoryMonitor = MemoryMonitor()
+        self.memory_monitor.register(
+            "images",
+            self.image_processor.memory_usage,
+            self.image_processor.shed_memory,
+        )
+        self.memory_monitor.register(
+            "roster", lambda: self.scanner.roster.memory_bytes()
+        )
 
         self._setup_ui()
         self._setup_automation()
         self._check_and_update_data()
+        self.memory_monitor.start()
 
     def _setup_ui(self) -> None:
         self.setWindowTitle(_("NIKKE OCR"))
@@ -117,6 +134,14 @@ class NikkeOCRUI(QMainWindow):
         self.log_text.setReadOnly(True)
         self.log_text.setMaximumHeight(80)
         bottom_layout.addWidget(self.log_text)
+        self.log_sink: UILogSink = UILogSink(self.log_text)
+
+        self.memory_label: QLabel = QLabel()
+        self.memory_label.setWordWrap(True)
+        bottom_layout.addWidget(self.memory_label)
+        self.memory_timer: QTimer = QTimer(self)
+        self.memory_timer.timeout.connect(self._update_memory_label)
+        self.memory_timer.start(Config.MEMORY_REPORT_INTERVAL_MS)
 
         self.progress_bar: QProgressBar = QProgressBar(self)
         bottom_layout.addWidget(self.progress_bar)
@@ -130,6 +155,14 @@ class NikkeOCRUI(QMainWindow):
             for rarity, checkbox in self.rarity_checkboxes.items()
             if checkbox.isChecked()
         ]
+        self.scanner.selected_rarities = self.selected_rarities
+
+    def _update_memory_label(self) -> None:
+        # Sampled on the monitor thread; this only displays the latest values
+        if self.memory_monitor.last_sample:
+            self.memory_label.setText(
+                _("Memory: {summary}").format(summary=self.memory_monitor.summary())
+            )
 
     def _check_and_update_data(self) -> None:
         self.data_manager.progress_updated.connect(self._update_progress)
@@ -146,17 +179,31 @@ class NikkeOCRUI(QMainWindow):
     def _setup_menu_bar(self) -> None:
         menubar = self.menuBar()
         if menubar is None:
-            self.log("Error: Unable to create menu bar")
+            self.log(_("Error: Unable to create menu bar"))
             return
 
         file_menu = menubar.addMenu(_("File"))
         if file_menu:
+            resume_action = QAction(_("Resume Scan (F2)"), self)
+            resume_action.triggered.connect(self._resume_automation)
+            file_menu.addAction(resume_action)
+
+            analyze_action = QAction(_("Analyze Frame Log..."), self)
+            analyze_action.triggered.connect(self._choose_frame_log)
+            file_menu.addAction(analyze_action)
+
             exit_action = QAction(_("Exit"), self)
             exit_action.triggered.connect(self._close_application)
             file_menu.addAction(exit_action)
 
         settings_menu = menubar.addMenu(_("Settings"))
         if settings_menu:
+            capture_action = QAction(_("Capture-only Scan"), self)
+            capture_action.setCheckable(True)
+            capture_action.setChecked(self.capture_only)
+            capture_action.toggled.connect(self._set_capture_only)
+            settings_menu.addAction(capture_action)
+
             language_menu = settings_menu.addMenu(_("Language"))
             if language_menu:
                 language_group = QActionGroup(self)
@@ -173,9 +220,12 @@ class NikkeOCRUI(QMainWindow):
 
                 language_group.triggered.connect(self._change_language)
             else:
-                self.log("Error: Unable to create language submenu")
+                self.log(_("Error: Unable to create language submenu"))
         else:
-            self.log("Error: Unable to create settings menu")
+            self.log(_("Error: Unable to create settings menu"))
+
+    def _set_capture_only(self, enabled: bool) -> None:
+        self.capture_only = enabled
 
     def _change_language(self, action: QAction) -> None:
         lang = action.data()
@@ -208,6 +258,8 @@ class NikkeOCRUI(QMainWindow):
     def _on_key_press(self, key: Union[Key, KeyCode, None]) -> None:
         if key == keyboard.Key.f1:
             self._toggle_automation()
+        elif key == keyboard.Key.f2:
+            self._resume_automation()
 
     def _toggle_automation(self) -> None:
         if not self.automation_active:
@@ -215,11 +267,25 @@ class NikkeOCRUI(QMainWindow):
         else:
             self._stop_automation()
 
-    def _start_automation(self) -> None:
+    def _resume_automation(self) -> None:
+        if self.automation_active:
+            return
+        state = self.checkpoint.load()
+        if state is None:
+            self.log(_("No interrupted scan to resume."))
+            return
+        self._start_automation(state)
+
+    def _start_automation(self, resume_state: Optional[Dict[str, Any]] = None) -> None:
         self.automation_active = True
-        self.current_step = 0
-        self.first_nikke_name = None
-        self.processed_nikkes = 0
+        self.scanner.roster = self.data_manager.get_roster_index()
+        self.scanner.selected_rarities = self.selected_rarities
+        self.scanner.capture_only = self.capture_only
+        self.scanner.start(resume_state)
+        if resume_state is not None:
+            restored = list(self.scanner.selected_rarities)
+            for rarity, checkbox in self.rarity_checkboxes.items():
+                checkbox.setChecked(rarity in restored)
         self.status_label.setText(_("Status: Running (Press F1 to stop)"))
         self.log(_("Automation started. Performing click sequence..."))
         self._perform_automation()
@@ -227,14 +293,48 @@ class NikkeOCRUI(QMainWindow):
     def _stop_automation(self) -> None:
         self.automation_active = False
         self.timer.stop()
-        self.current_step = 0
+        frame_log_path = self.scanner.stop()
         self.status_label.setText(_("Status: Idle (Press F1 to start)"))
         self.log(_("Automation stopped and reset"))
-        self.log(f"Total Nikkes processed: {self.processed_nikkes}")
-
-    def _move_to_next_character(self) -> None:
-        self.log(_("Clicking to move to next character."))
-        self.click_sequence.perform_click(self.config.CLICK_X, self.config.CLICK_Y, 1)
+        self.log(
+            _("Total Nikkes processed: {count}").format(
+                count=self.scanner.processed_nikkes
+            )
+        )
+
+        if frame_log_path is not None:
+            self._start_frame_analysis(frame_log_path)
+
+    def _choose_frame_log(self) -> None:
+        path, _selected = QFileDialog.getOpenFileName(
+            self,
+            _("Analyze Frame Log..."),
+            str(self.config.FRAME_LOG_DIR),
+            "Frame logs (*.bin)",
+        )
+        if path:
+            self._start_frame_analysis(path)
+
+    def _start_frame_analysis(self, path: Any) -> None:
+        self.log(f"Analyzing frame log {path}...")
+        threading.Thread(
+            target=self._run_frame_analysis,
+            args=(path, list(self.selected_rarities)),
+            daemon=True,
+        ).start()
+
+    def _run_frame_analysis(self, path: Any, selected_rarities: List[str]) -> None:
+        # Runs off the GUI thread; only logging is used to report back
+        try:
+            output_file = analyze_frame_log(
+                path,
+                self.data_manager.get_roster_index(),
+                selected_rarities,
+                self.image_processor,
+            )
+            self.log(f"Frame log analysis saved to {output_file}")
+        except Exception as e:
+            logger.exception(f"Frame log analysis failed: {e}")
 
     @pyqtSlot()
     def _perform_automation(self) -> None:
@@ -247,235 +347,38 @@ class NikkeOCRUI(QMainWindow):
             return
 
         try:
-            if self.current_step == 0:
-                self.log("Executing initial click sequence...")
-                self.click_sequence.execute_sequence()
-                self.log("Click sequence completed. Starting character processing...")
-                self.current_step = 1
-                self.first_character_name = None
-                self.timer.start(100)
-            elif self.current_step == 1:
-                self.log("Capturing screenshot...")
-                screenshot = cv2.cvtColor(
-                    np.array(pyautogui.screenshot()), cv2.COLOR_RGB2BGR
-                )
-                self.log("Screenshot captured")
-
-                rarity = self.image_processor.identify_rarity(screenshot)
-                self.log(f"Detected rarity: {rarity}")
-
-                if rarity == "Unknown":
-                    self.log("Unable to determine rarity. Analyzing character...")
-                elif rarity not in self.selected_rarities:
-                    self.log(
-                        f"Skipping {rarity} character as it's not selected for processing"
-                    )
-                    self._move_to_next_character()
-                    return
-
-                coords = Config.ATTRIBUTE_COORDS[rarity]
-
-                # cp_roi = screenshot[335:389, 1724:1870]
-                cp_roi = screenshot[
-                    Config.ATTRIBUTE_COORDS[rarity]["cp"][
-                        "top"
-                    ] : Config.ATTRIBUTE_COORDS[rarity]["cp"]["bottom"],
-                    Config.ATTRIBUTE_COORDS[rarity]["cp"][
-                        "left"
-                    ] : Config.ATTRIBUTE_COORDS[rarity]["cp"]["right"],
-                ]
-                cp_value = self.image_processor.process_roi(cp_roi)
-                self.log(f"Extracted Combat Power: {cp_value}")
-
-                name_roi = screenshot[234:267, 1733:1863]
-                ocr_result = self.image_processor.process_roi(name_roi)
-                self.log(f"OCR Result: {ocr_result}")
-
-                if ocr_result and ocr_result.lower() not in ["rei", "quency"]:
-                    matching_nikkes = self._find_matching_nikkes(ocr_result)
-                    if len(matching_nikkes) == 1:
-                        nikke_info = matching_nikkes[0]
-                        self.log(
-                            f"Unique Nikke identified by name: {nikke_info['name']}"
-                        )
-                        nikke_info["combat_power"] = cp_value
-                        nikke_info["rarity"] = rarity
-                        self._handle_character(nikke_info)
-                        self._move_to_next_character()
-                        return
-                    elif len(matching_nikkes) > 1:
-                        self.log(
-                            f"Multiple Nikkes found with name {ocr_result}. Proceeding with detailed identification."
-                        )
-                    else:
-                        self.log(
-                            f"No Nikke found with name {ocr_result}. Proceeding with detailed identification."
-                        )
-                elif ocr_result and ocr_result.lower() in ["rei", "quency"]:
-                    self.log(
-                        "Nikke named Rei or Quency detected. Proceeding with detailed identification due to multiple characters with this name."
-                    )
-
-                # If not uniquely identified by name or is "Rei", continue with detailed process
-                nikke_info: Optional[Dict[str, Any]] = self._get_nikke_info(
-                    screenshot, coords
-                )
-
-                if nikke_info:
-                    nikke_info["combat_power"] = cp_value
-                    nikke_info["rarity"] = rarity
-                    self._handle_character(nikke_info)
-
-                    if self.first_nikke_name is None:
-                        self.first_nikke_name = nikke_info["name"]
-                        self.log(f"First Nikke detected: {self.first_nikke_name}")
-                    elif nikke_info["name"] == self.first_nikke_name:
-                        self.log("Cycle completed. Stopping automation.")
-                        self._stop_automation()
-                        QMessageBox.information(
-                            self,
-                            _("Process Completed"),
-                            _("All characters have been processed."),
-                        )
-                        return
-
-                    self.processed_nikkes += 1
-                    self.log(f"Processed Nikkes: {self.processed_nikkes}")
-                else:
-                    self.log("Failed to identify Nikke. Moving to next character.")
-
-                self._move_to_next_character()
-
+            status = self.scanner.step()
         except Exception as e:
             self.log(f"Error in perform_automation: {str(e)}")
             import traceback
 
             self.log(traceback.format_exc())  # This will print the full stack trace
+            return
 
-    def _find_matching_nikkes(self, name: str) -> List[Dict[str, Any]]:
-        nikke_data = self.data_manager.get_nikke_data()
-        return [nikke for nikke in nikke_data if nikke["name"].lower() == name.lower()]
-
-    def _get_nikke_info(
-        self, screenshot: np.ndarray, coords: Dict[str, Dict[str, int]]
-    ) -> Optional[Dict[str, Any]]:
-        nikke_data = self.data_manager.get_nikke_data()
-        filtered_nikkes: List[Dict[str, Any]] = nikke_data
-
-        weapon_map: Dict[str, str] = {
-            "Sniper Rifle": "SR",
-            "Submachine Gun": "SMG",
-            "Machine Gun": "MG",
-            "Assault Rifle": "AR",
-            "Shotgun": "SG",
-            "Rocket Launcher": "RL",
-        }
-
-        attributes = [
-            (
-                "element",
-                lambda: self._get_attribute(
-                    (coords["element"]["x"], coords["element"]["y"]),
-                    (837, 540, 242, 57),
-                ),
-            ),
-            (
-                "weapon",
-                lambda: weapon_map.get(
-                    self._get_attribute(
-                        (coords["weapon"]["x"], coords["weapon"]["y"]),
-                        (825, 402, 380, 40),
-                    )
-                    or "",
-                ),
-            ),
-            (
-                "squad",
-                lambda: self._get_attribute(
-                    (coords["squad"]["x"], coords["squad"]["y"]), (723, 299, 487, 51)
-                ),
-            ),
-            ("burst", lambda: self.image_processor.identify_burst(screenshot)),
-        ]
-
-        for attr_name, getter_func in attributes:
-            attr_value = getter_func()
-            if attr_value:
-                self.log(f"Detected {attr_name}: {attr_value}")
-                filtered_nikkes = [
-                    n for n in filtered_nikkes if n[attr_name] == attr_value
-                ]
-                self.log(f"Filtered to {len(filtered_nikkes)} possible Nikkes")
-
-                if len(filtered_nikkes) == 1:
-                    self.log(f"Unique Nikke identified: {filtered_nikkes[0]['name']}")
-                    return filtered_nikkes[0]
-                elif len(filtered_nikkes) == 0:
-                    self.log(
-                        "No matching Nikkes found. Stopping identification process."
-                    )
-                    return None
-
-        if len(filtered_nikkes) > 1:
-            return self._compare_images(screenshot, filtered_nikkes)
-
-        return None
-
-    def _get_attribute(
-        self,
-        click_pos: Tuple[int, int],
-        screenshot_region: Tuple[int, int, int, int],
-        valid_values: Optional[List[str]] = None,
-    ) -> Optional[str]:
-        self.click_sequence.perform_click(*click_pos, 1)
-        screenshot = pyautogui.screenshot(region=screenshot_region)
-        attribute = self.image_processor.process_roi(np.array(screenshot))
-        self.log(f"Attribute: {attribute}")
-        self.click_sequence.perform_click(10, 10, 0)
-        return attribute if valid_values is None or attribute in valid_values else None
-
-    def _compare_images(
-        self, screenshot: np.ndarray, nikkes: List[Dict[str, Any]]
-    ) -> Optional[Dict[str, Any]]:
-        nikke_image = screenshot[118:793, 292:1439]
-        best_match: Optional[Dict[str, Any]] = None
-        best_score: float = -1
-
-        for nikke in nikkes:
-            reference_image: np.ndarray = cv2.imread(
-                f"{self.config.GENERATED_IMAGES_DIR}/{nikke['images']['big']}",
-                cv2.IMREAD_UNCHANGED,  # This will load the image as-is, whether it's color or grayscale
+        if status == Scanner.COMPLETED:
+            self._stop_automation()
+            QMessageBox.information(
+                self,
+                _("Process Completed"),
+                _("All characters have been processed."),
             )
-
-            if reference_image is None:
-                print(f"Warning: Could not load image for {nikke['name']}")
-                continue
-
-            score: float = self.compare_images(nikke_image, reference_image)
-            if score > best_score:
-                best_score = score
-                best_match = nikke
-
-        return best_match
-
-    def _handle_character(self, nikke_info: Dict[str, Any]) -> None:
-        name: str = nikke_info["name"]
-        self.log(f"Identified Nikke: {name}")
-
-        if self.database.add_or_update_character(name, nikke_info):
-            self.log(f"Updated database for {name}")
-        else:
-            self.log(f"Failed to update database for {name}")
+        elif not self.timer.isActive():
+            self.timer.start(Config.SCAN_STEP_INTERVAL_MS)
 
     def _close_application(self) -> None:
         self.close()
 
     def log(self, message: str) -> None:
+        # Static messages are translated at the call site; this only enqueues
         logger.info(message)
-        self.log_text.append(_(message))
 
     def closeEvent(self, event: QCloseEvent) -> None:
         self.keyboard_handler.stop()
+        self.log_sink.stop()
+        self.memory_timer.stop()
+        self.memory_monitor.stop()
+        self.scanner.stop()
         self.database.close()
+        self.image_processor.close()
         self.automation_active = False
         super().closeEvent(event)
@@ -1,12 +1,15 @@
+import multiprocessing
 import sys
 
 from PyQt5.QtWidgets import QApplication
 
 from src.gui.ui import NikkeOCRUI
 from src.utils.localization import set_language
+from src.utils.log_sink import configure_logging
 
 
 def main():
+    configure_logging()
     app = QApplication(sys.argv)
     set_language("en")
 
@@ -16,4 +19,5 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,67 @@
+from typing import Optional, Set, Tuple
+
+import cv2
+import numpy as np
+
+from src.config import Config
+
+
+def crop(screenshot: np.ndarray, roi: Tuple[int, int, int, int]) -> np.ndarray:
+    left, top, right, bottom = roi
+    return screenshot[top:bottom, left:right]
+
+
+def dhash(image: np.ndarray, hash_size: int = Config.FINGERPRINT_HASH_SIZE) -> int:
+    """Difference hash: one bit per horizontally adjacent pixel pair."""
+    if len(image.shape) == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(image, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def frame_fingerprint(screenshot: np.ndarray) -> int:
+    """Combined perceptual hash of the portrait and name regions of a frame."""
+    portrait = dhash(crop(screenshot, Config.PORTRAIT_ROI))
+    name = dhash(crop(screenshot, Config.NAME_ROI))
+    return (portrait << (Config.FINGERPRINT_HASH_SIZE**2)) | name
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class FingerprintSet:
+    """Fingerprints of every frame seen during a run.
+
+    Exact repeats are a set lookup; near repeats (rendering noise, animated
+    backgrounds) fall back to a Hamming distance scan, which is cheap for the
+    few hundred characters in a roster.
+    """
+
+    def __init__(self, max_distance: int = Config.FINGERPRINT_MAX_DISTANCE) -> None:
+        self.max_distance = max_distance
+        self.seen: Set[int] = set()
+
+    def find(self, fingerprint: int) -> Optional[int]:
+        if fingerprint in self.seen:
+            return fingerprint
+        for candidate in self.seen:
+            if hamming_distance(fingerprint, candidate) <= self.max_distance:
+                return candidate
+        return None
+
+    def add(self, fingerprint: int) -> None:
+        self.seen.add(fingerprint)
+
+    def discard(self, fingerprint: int) -> None:
+        self.seen.discard(fingerprint)
+
+    def clear(self) -> None:
+        self.seen.clear()
+
+    def __contains__(self, fingerprint: int) -> bool:
+        return self.find(fingerprint) is not None
+
+    def __len__(self) -> int:
+        return len(self.seen)
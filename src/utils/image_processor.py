@@ -1,35 +1,111 @@
+import logging
 import os
+import threading
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 import cv2
-import easyocr
 import numpy as np
-from skimage.metrics import structural_similarity as ssim
 
 from src.config import Config
+from src.utils.ocr_backend import LazyOCRBackend, OCRBackend, create_ocr_backend
+from src.utils.ocr_pool import OCRWorkerPool
+from src.utils.preprocess import PreprocessEngine
+from src.utils.similarity import SimilarityEngine
+
+logger = logging.getLogger(__name__)
+
+
+def _map_future(future: Future, func: Callable[[Any], Any]) -> Future:
+    mapped: Future = Future()
+
+    def _done(source: Future) -> None:
+        if mapped.done():
+            # Cancelled by the caller while the OCR job was still running
+            return
+        if source.cancelled():
+            mapped.cancel()
+        elif source.exception() is not None:
+            mapped.set_exception(source.exception())
+        else:
+            mapped.set_result(func(source.result()))
+
+    future.add_done_callback(_done)
+    return mapped
+
+
+def _first_text(results: List[Any]) -> Optional[str]:
+    return results[0][1] if results else None
+
+
+def _joined_text(results: List[Any]) -> str:
+    return " ".join([result[1] for result in results]) if results else ""
 
 
 class OCRProcessor:
-    def __init__(self) -> None:
-        self.reader = easyocr.Reader([Config.OCR_LANGUAGE], gpu=False)
+    def __init__(self, reader: Optional[Any] = None) -> None:
+        # Any OCRBackend, or anything else with its readtext() signature (OCRWorkerPool)
+        self.reader = reader or create_ocr_backend()
+        self.preprocess: PreprocessEngine = PreprocessEngine()
+        # An in-process reader may be shared by the scan and a frame log analysis
+        self._reader_lock = threading.Lock()
+
+    def _submit(self, image: np.ndarray, **kwargs: Any) -> Future:
+        if isinstance(self.reader, OCRWorkerPool):
+            return self.reader.submit(image, **kwargs)
+        future: Future = Future()
+        with self._reader_lock:
+            future.set_result(self.reader.readtext(image, **kwargs))
+        return future
+
+    def submit_name_roi(self, image: np.ndarray) -> "Future[Optional[str]]":
+        # The binarized buffer is reused; the pool copies it before returning
+        return _map_future(self._submit(self.preprocess.binarize(image)), _first_text)
+
+    def submit_rarity_roi(self, image: np.ndarray) -> "Future[str]":
+        return _map_future(
+            self._submit(image, allowlist="RSr", min_size=10, width_ths=2.0),
+            _joined_text,
+        )
 
     def process_name_roi(self, image: np.ndarray) -> Optional[str]:
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        results = self.reader.readtext(binary)
-        return results[0][1] if results else None
+        return self.submit_name_roi(image).result(timeout=Config.OCR_RESULT_TIMEOUT)
 
     def process_rarity_roi(self, image: np.ndarray) -> str:
-        results = self.reader.readtext(
-            image, allowlist="RSr", min_size=10, width_ths=2.0
-        )
-        return " ".join([result[1] for result in results]) if results else ""
+        return self.submit_rarity_roi(image).result(timeout=Config.OCR_RESULT_TIMEOUT)
+
+    def memory_usage(self) -> Dict[str, Optional[int]]:
+        if isinstance(self.reader, (OCRWorkerPool, OCRBackend)):
+            return self.reader.memory_usage()
+        return {"models": None}
+
+    def unload(self) -> bool:
+        """Releases idle OCR models if the reader allows it; returns whether it did."""
+        if isinstance(self.reader, LazyOCRBackend):
+            return self.reader.unload_idle()
+        if isinstance(self.reader, OCRWorkerPool):
+            logger.debug("OCR worker models stay loaded; worker memory is not shed")
+        else:
+            logger.debug(
+                "OCR models stay loaded; enable Config.LOW_MEMORY_MODE to release them"
+            )
+        return False
+
+    def close(self) -> None:
+        close = getattr(self.reader, "close", None)
+        if close is not None:
+            close()
 
 
 class ImageProcessor:
-    def __init__(self) -> None:
-        self.ocr_processor: OCRProcessor = OCRProcessor()
+    def __init__(self, ocr_processor: Optional[OCRProcessor] = None) -> None:
+        if ocr_processor is None:
+            reader = OCRWorkerPool() if Config.OCR_WORKERS > 0 else None
+            ocr_processor = OCRProcessor(reader)
+        self.ocr_processor: OCRProcessor = ocr_processor
+        self.similarity: SimilarityEngine = SimilarityEngine()
+        self.preprocess: PreprocessEngine = PreprocessEngine()
         self.burst_references: Dict[str, np.ndarray] = {}
         self.load_burst_references()
 
@@ -43,58 +119,74 @@ class ImageProcessor:
     def process_roi(self, image: np.ndarray) -> Optional[str]:
         return self.ocr_processor.process_name_roi(image)
 
-    def compare_images(self, img1: np.ndarray, img2: np.ndarray) -> float:
-        # Ensure both images have the same dimensions
-        img2 = cv2.resize(img2, (img1.shape[1], img1.shape[0]))
+    def submit_roi(self, image: np.ndarray) -> "Future[Optional[str]]":
+        return self.ocr_processor.submit_name_roi(image)
 
-        # Convert images to grayscale if they're not already
-        if len(img1.shape) == 3:
-            gray1 = cv2.cvtColor(img1, cv2.COLOR_BGR2GRAY)
-        else:
-            gray1 = img1
+    def close(self) -> None:
+        self.ocr_processor.close()
 
-        if len(img2.shape) == 3:
-            gray2 = cv2.cvtColor(img2, cv2.COLOR_BGR2GRAY)
-        else:
-            gray2 = img2
+    def memory_usage(self) -> Dict[str, Optional[int]]:
+        usage = {f"ocr.{k}": v for k, v in self.ocr_processor.memory_usage().items()}
+        usage["similarity_cache"] = self.similarity.cache.nbytes
+        usage["burst_references"] = sum(
+            image.nbytes for image in self.burst_references.values()
+        )
+        return usage
 
-        # Compute SSIM
-        score, _ = ssim(gray1, gray2, full=True)
-        return score
+    def shed_memory(self) -> bool:
+        """Drops what can be rebuilt: cached reference pyramids and idle OCR models.
 
-    def identify_burst(self, screenshot: np.ndarray) -> Optional[str]:
-        roi: np.ndarray = screenshot[341:400, 1635:1696]
-        best_match: Optional[str] = None
-        best_score: float = -1
+        Returns whether anything was released.
+        """
+        cached = len(self.similarity.cache) > 0
+        self.similarity.cache.clear()
+        unloaded = self.ocr_processor.unload()
+        return cached or unloaded
 
-        for filename, ref_img in self.burst_references.items():
-            ref_img = cv2.resize(ref_img, (roi.shape[1], roi.shape[0]))
-            score: float = self.compare_images(roi, ref_img)
+    def compare_images(self, img1: np.ndarray, img2: np.ndarray) -> float:
+        return self.similarity.score(img1, img2)
+
+    def match_reference(
+        self,
+        image: np.ndarray,
+        keys: Sequence[str],
+        load: Callable[[str], Optional[np.ndarray]],
+    ) -> Optional[Tuple[str, float]]:
+        """Best ``(key, score)`` among the references ``load`` returns for ``keys``."""
+        return self.similarity.best_match(image, keys, load)
+
+    def rank_references(
+        self,
+        image: np.ndarray,
+        keys: Sequence[str],
+        load: Callable[[str], Optional[np.ndarray]],
+    ) -> List[Tuple[str, float]]:
+        """``(key, score)`` pairs of the closest references, best first."""
+        return self.similarity.rank(image, keys, load)
+
+    def load_portrait(self, image_path: str) -> Optional[np.ndarray]:
+        # Image paths in the roster are relative to the generated data folder
+        reference_image = cv2.imread(
+            str(Config.GENERATED_DIR / image_path),
+            cv2.IMREAD_UNCHANGED,  # This will load the image as-is, whether it's color or grayscale
+        )
+        if reference_image is None:
+            print(f"Warning: Could not load image {image_path}")
+        return reference_image
 
-            if score > best_score:
-                best_score = score
-                best_match = filename
+    def identify_burst(self, screenshot: np.ndarray) -> Optional[str]:
+        left, top, right, bottom = Config.BURST_ROI
+        return self.identify_burst_roi(screenshot[top:bottom, left:right])
 
-        return best_match.split(".")[0] if best_match else None
+    def identify_burst_roi(self, roi: np.ndarray) -> Optional[str]:
+        match = self.match_reference(
+            roi, list(self.burst_references), self.burst_references.get
+        )
+        return match[0].split(".")[0] if match else None
 
     def preprocess_image(self, roi: np.ndarray) -> np.ndarray:
-        hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
-        orange_mask = cv2.inRange(
-            hsv, np.array([0, 100, 100]), np.array([30, 255, 255])
-        )
-        blue_mask = cv2.inRange(hsv, np.array([90, 50, 50]), np.array([130, 255, 255]))
-        pink_mask = cv2.inRange(hsv, np.array([140, 50, 50]), np.array([170, 255, 255]))
-        combined_mask = cv2.bitwise_or(
-            cv2.bitwise_or(orange_mask, blue_mask), pink_mask
-        )
-        result = cv2.bitwise_and(roi, roi, mask=combined_mask)
-        lab = cv2.cvtColor(result, cv2.COLOR_BGR2LAB)
-        l, a, b = cv2.split(lab)
-        clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
-        cl = clahe.apply(l)
-        limg = cv2.merge((cl, a, b))
-        final = cv2.cvtColor(limg, cv2.COLOR_LAB2BGR)
-        return final
+        # Returns a reused buffer; copy it if it has to outlive the next call
+        return self.preprocess.enhance_rarity(roi)
 
     def classify_color(self, roi: np.ndarray) -> str:
         hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
@@ -113,14 +205,17 @@ class ImageProcessor:
             Config.RARITY_ROI[1] : Config.RARITY_ROI[3],
             Config.RARITY_ROI[0] : Config.RARITY_ROI[2],
         ]
+        return self.identify_rarity_roi(roi)
+
+    def identify_rarity_roi(self, roi: np.ndarray) -> str:
         processed_roi = self.preprocess_image(roi)
         ocr_result = self.ocr_processor.process_rarity_roi(processed_roi)
         color_class = self.classify_color(roi)
 
-        print(f"ROI shape: {roi.shape}")
-        print(f"Processed ROI shape: {processed_roi.shape}")
-        print(f"OCR result: {ocr_result}")
-        print(f"Color classification: {color_class}")
+        logger.debug(f"ROI shape: {roi.shape}")
+        logger.debug(f"Processed ROI shape: {processed_roi.shape}")
+        logger.debug(f"OCR result: {ocr_result}")
+        logger.debug(f"Color classification: {color_class}")
 
         final_result = self.validate_result(ocr_result, color_class)
 
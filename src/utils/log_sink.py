@@ -0,0 +1,73 @@
+import atexit
+import logging
+import queue
+import threading
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener
+from typing import Deque, List, Optional
+
+from src.config import Config
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the newest formatted records in a bounded buffer until drained."""
+
+    def __init__(self, capacity: int = Config.LOG_BUFFER_SIZE) -> None:
+        super().__init__()
+        self.buffer: Deque[str] = deque(maxlen=capacity)
+        self.dropped: int = 0
+        self._buffer_lock = threading.Lock()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        message = self.format(record)
+        with self._buffer_lock:
+            if len(self.buffer) == self.buffer.maxlen:
+                self.dropped += 1
+            self.buffer.append(message)
+
+    def drain(self) -> List[str]:
+        with self._buffer_lock:
+            messages = list(self.buffer)
+            self.buffer.clear()
+            if self.dropped:
+                messages.insert(0, f"... {self.dropped} older log messages dropped")
+                self.dropped = 0
+        return messages
+
+
+_listener: Optional[QueueListener] = None
+_ui_buffer = RingBufferHandler()
+_ui_buffer.addFilter(logging.Filter("src"))
+
+
+def configure_logging(level: str = Config.LOG_LEVEL) -> QueueListener:
+    """Routes all logging through a queue drained by a background thread.
+
+    Callers only pay for enqueueing a record; formatting and output to the
+    console and the UI buffer happen on the listener thread. Safe to call more
+    than once.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(LOG_FORMAT))
+    _ui_buffer.setFormatter(logging.Formatter("%(message)s"))
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
+
+    _listener = QueueListener(log_queue, console, _ui_buffer)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _listener
+
+
+def drain_ui_messages() -> List[str]:
+    """Messages logged since the last call, for the UI log view."""
+    return _ui_buffer.drain()
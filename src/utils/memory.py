@@ -0,0 +1,229 @@
+import gc
+import logging
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+import numpy as np
+
+from src.config import Config
+
+try:
+    import psutil
+except ImportError:  # Reporting falls back to tracked bytes only
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+MIB = 1024 * 1024
+# Most monitor ticks skipped between shedding attempts while over the ceiling
+MAX_SHED_BACKOFF_TICKS = 32
+
+
+def nbytes_of(value: Any) -> int:
+    """Bytes held by an array, or by the arrays of a list/tuple."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (list, tuple)):
+        return sum(nbytes_of(item) for item in value)
+    return 0
+
+
+class ByteLRUCache:
+    """Mapping bounded by the total bytes of its values, evicting least recently used.
+
+    A value larger than the whole budget is not cached at all.
+    """
+
+    def __init__(
+        self, max_bytes: int, sizeof: Callable[[Any], int] = nbytes_of
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.nbytes = 0
+        self.evictions = 0
+        self._items: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = self.sizeof(value)
+        with self._lock:
+            self._remove(key)
+            if size > self.max_bytes:
+                return
+            self._items[key] = value
+            self._sizes[key] = size
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                oldest = next(iter(self._items))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        if key in self._items:
+            del self._items[key]
+            self.nbytes -= self._sizes.pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+def process_rss(pid: Optional[int] = None) -> Optional[int]:
+    """Resident set size of a process in bytes, or None if it can't be read."""
+    if psutil is None:
+        return None
+    try:
+        return psutil.Process(pid).memory_info().rss
+    except psutil.Error:
+        return None
+
+
+def release_memory() -> None:
+    """Collects garbage and hands freed heap pages back to the OS where possible."""
+    gc.collect()
+    if sys.platform.startswith("linux"):
+        import ctypes
+
+        try:
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+        except (OSError, AttributeError):
+            pass
+
+
+def format_bytes(value: Optional[int]) -> str:
+    return "n/a" if value is None else f"{value / MIB:.0f} MiB"
+
+
+class MemoryMonitor:
+    """Samples memory per component and enforces ``Config.MEMORY_LIMIT_MB``.
+
+    Components register a probe returning their bytes: tracked sizes for
+    caches and the roster, the RSS growth measured while OCR models loaded
+    (or a labelled estimate without psutil), and real RSS for helper
+    processes such as OCR workers. The process total is always sampled.
+    When the process RSS exceeds the ceiling, the registered shedders run
+    (unload idle models, drop caches) before the memory is released; each
+    returns whether it could release anything. If RSS stays over the
+    ceiling, later attempts back off instead of repeating every tick.
+    """
+
+    def __init__(
+        self,
+        limit_mb: int = Config.MEMORY_LIMIT_MB,
+        interval_ms: int = Config.MEMORY_REPORT_INTERVAL_MS,
+    ) -> None:
+        self.limit_bytes = limit_mb * MIB
+        self.interval = interval_ms / 1000
+        self.probes: Dict[str, Callable[[], Any]] = {}
+        self.shedders: List[Callable[[], bool]] = []
+        self.last_sample: Dict[str, Optional[int]] = {}
+        # While over the ceiling, shedding is retried after a doubling number
+        # of ticks rather than on every tick
+        self._backoff_ticks = 0
+        self._skip_ticks = 0
+        self._warned_still_over = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(
+        self,
+        name: str,
+        probe: Callable[[], Any],
+        shed: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        """``probe`` returns bytes, or a dict of sub-component name to bytes."""
+        self.probes[name] = probe
+        if shed is not None:
+            self.shedders.append(shed)
+
+    def sample(self) -> Dict[str, Optional[int]]:
+        sample: Dict[str, Optional[int]] = {"process": process_rss()}
+        for name, probe in self.probes.items():
+            try:
+                value = probe()
+            except Exception as e:
+                logger.debug(f"Memory probe {name} failed: {e}")
+                continue
+            if isinstance(value, dict):
+                sample.update({f"{name}.{k}": v for k, v in value.items()})
+            else:
+                sample[name] = value
+        self.last_sample = sample
+        return sample
+
+    def enforce(self, sample: Dict[str, Optional[int]]) -> None:
+        rss = sample.get("process")
+        if not self.limit_bytes or rss is None or rss <= self.limit_bytes:
+            self._backoff_ticks = 0
+            self._skip_ticks = 0
+            self._warned_still_over = False
+            return
+        if self._skip_ticks > 0:
+            self._skip_ticks -= 1
+            return
+        over = (
+            f"Memory {format_bytes(rss)} over the "
+            f"{format_bytes(self.limit_bytes)} ceiling"
+        )
+        if self._backoff_ticks and not self._warned_still_over:
+            logger.warning(
+                f"{over} after shedding; retrying with backoff. OCR models are "
+                f"only unloaded once idle, and only in low-memory mode "
+                f"(Config.LOW_MEMORY_MODE)"
+            )
+            self._warned_still_over = True
+        released = any([shed() for shed in self.shedders])
+        outcome = "released idle models and caches" if released else "nothing idle"
+        if not self._backoff_ticks:
+            logger.warning(f"{over}; {outcome}")
+        else:
+            logger.info(f"{over}; {outcome}")
+        release_memory()
+        self._backoff_ticks = min(
+            max(1, self._backoff_ticks * 2), MAX_SHED_BACKOFF_TICKS
+        )
+        self._skip_ticks = self._backoff_ticks
+
+    def summary(self, sample: Optional[Dict[str, Optional[int]]] = None) -> str:
+        sample = self.last_sample if sample is None else sample
+        return ", ".join(f"{name} {format_bytes(v)}" for name, v in sample.items())
+
+    def tick(self) -> Dict[str, Optional[int]]:
+        sample = self.sample()
+        self.enforce(sample)
+        level = logging.INFO if Config.LOW_MEMORY_MODE else logging.DEBUG
+        logger.log(level, f"Memory: {self.summary(sample)}")
+        return sample
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="memory-monitor", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.tick()
+
+    def stop(self) -> None:
+        self._stop.set()
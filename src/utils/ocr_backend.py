@@ -0,0 +1,298 @@
+import itertools
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import Config
+from src.utils.memory import format_bytes, process_rss, release_memory
+
+logger = logging.getLogger(__name__)
+
+OCRResult = Tuple[List[List[int]], str, float]
+
+
+class OCRBackend(ABC):
+    """Recognition interface shared by every OCR engine the scanner can use."""
+
+    name: str = ""
+    # Growth of the process RSS while the models loaded; None if not measured
+    loaded_bytes: Optional[int] = None
+
+    @abstractmethod
+    def readtext(self, image: np.ndarray, **kwargs: Any) -> List[OCRResult]:
+        """Returns ``(bbox, text, confidence)`` tuples, like easyocr.Reader.readtext."""
+
+    def readtext_batch(
+        self, images: Iterable[np.ndarray], **kwargs: Any
+    ) -> List[List[OCRResult]]:
+        return [self.readtext(image, **kwargs) for image in images]
+
+    @staticmethod
+    def confidence(results: List[OCRResult]) -> float:
+        if not results:
+            return 0.0
+        return float(sum(result[2] for result in results) / len(results))
+
+    def memory_bytes(self) -> int:
+        """Estimate of the bytes held by the loaded models, from their tensors."""
+        return 0
+
+    def memory_usage(self) -> Dict[str, Optional[int]]:
+        """Measured model memory, or the tensor estimate when RSS is unavailable."""
+        if self.loaded_bytes is not None:
+            return {"models": self.loaded_bytes}
+        return {"models (estimate)": self.memory_bytes()}
+
+    def close(self) -> None:
+        pass
+
+
+class EasyOCRBackend(OCRBackend):
+    """Stock easyocr with its default CPU models."""
+
+    name = "easyocr"
+
+    def __init__(self, language: str = Config.OCR_LANGUAGE) -> None:
+        import easyocr
+
+        self.language = language
+        before = process_rss()
+        self.reader = easyocr.Reader([language], gpu=False)
+        self._prepare_models()
+        after = process_rss()
+        if before is not None and after is not None:
+            self.loaded_bytes = max(0, after - before)
+
+    def _prepare_models(self) -> None:
+        """Adapts the loaded models; runs inside the load measurement."""
+
+    def readtext(self, image: np.ndarray, **kwargs: Any) -> List[OCRResult]:
+        return self.reader.readtext(image, **kwargs)
+
+    def memory_bytes(self) -> int:
+        # Misses packed weights of quantized and scripted modules
+        total = 0
+        for model in (self.reader.detector, self.reader.recognizer):
+            tensors = itertools.chain(model.parameters(), model.buffers())
+            total += sum(t.nelement() * t.element_size() for t in tensors)
+        return total
+
+
+class QuantizedEasyOCRBackend(EasyOCRBackend):
+    """easyocr with an int8 dynamically quantized, TorchScript-traced recognizer.
+
+    easyocr already quantizes its CPU models by default; quantizing again
+    only guarantees the recognizer is int8 should that default change. The
+    gain over the stock backend is the traced recognizer, which is cached
+    under ``Config.OCR_MODEL_CACHE_DIR``.
+    """
+
+    name = "easyocr-int8"
+
+    def _prepare_models(self) -> None:
+        self.reader.recognizer = self._load_recognizer()
+
+    @property
+    def cache_file(self) -> Path:
+        import easyocr
+        import torch
+
+        # A trace is only loadable by the torch that saved it, and only valid
+        # for the recognizer weights of that easyocr release
+        versions = f"torch{torch.__version__}_easyocr{easyocr.__version__}"
+        versions = "".join(c if c.isalnum() or c in "._-" else "_" for c in versions)
+        return (
+            Config.OCR_MODEL_CACHE_DIR
+            / f"recognizer_{self.language}_int8_{versions}.pt"
+        )
+
+    def _load_recognizer(self) -> Any:
+        import torch
+
+        if self.cache_file.exists():
+            try:
+                return torch.jit.load(str(self.cache_file), map_location="cpu")
+            except Exception as e:
+                logger.warning(f"Discarding cached recognizer {self.cache_file}: {e}")
+
+        quantized = torch.quantization.quantize_dynamic(
+            self.reader.recognizer.eval(),
+            {torch.nn.LSTM, torch.nn.Linear},
+            dtype=torch.qint8,
+        )
+        traced = self._trace(quantized)
+        if traced is None:
+            return quantized
+
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        torch.jit.save(traced, str(self.cache_file))
+        return traced
+
+    def _trace(self, model: Any) -> Optional[Any]:
+        import torch
+
+        # easyocr feeds batches of 64px high grayscale strips of varying width
+        # plus a dummy text tensor; only keep the trace if it generalises to
+        # other widths and batch sizes, otherwise stay in eager mode
+        def example(batch: int, width: int) -> Tuple[Any, Any]:
+            return (
+                torch.rand(batch, 1, 64, width),
+                torch.zeros(batch, 1, dtype=torch.long),
+            )
+
+        try:
+            with torch.no_grad():
+                traced = torch.jit.trace(model, example(1, 256), check_trace=False)
+                for check in (example(1, 160), example(4, 160), example(3, 320)):
+                    if not torch.allclose(traced(*check), model(*check), atol=1e-4):
+                        logger.info(
+                            "Traced recognizer does not generalise across "
+                            "input shapes; using the eager quantized model"
+                        )
+                        return None
+            return traced
+        except Exception as e:
+            logger.warning(
+                f"Recognizer tracing failed, using eager quantized model: {e}"
+            )
+            return None
+
+
+class LazyOCRBackend(OCRBackend):
+    """Loads the wrapped backend on first use and drops it after an idle timeout.
+
+    Used in low-memory mode: between scans the detector and recognizer
+    weights are released, and the next ``readtext`` loads them again.
+    """
+
+    def __init__(
+        self,
+        backend_name: str,
+        language: str = Config.OCR_LANGUAGE,
+        idle_timeout: float = Config.OCR_IDLE_UNLOAD_SECONDS,
+    ) -> None:
+        self.name = backend_name
+        self.language = language
+        self.idle_timeout = idle_timeout
+        self.backend: Optional[OCRBackend] = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    def readtext(self, image: np.ndarray, **kwargs: Any) -> List[OCRResult]:
+        with self._lock:
+            if self.backend is None:
+                start = time.perf_counter()
+                self.backend = OCR_BACKENDS[self.name](self.language)
+                logger.info(f"Loaded OCR models in {time.perf_counter() - start:.1f}s")
+            results = self.backend.readtext(image, **kwargs)
+            self._last_used = time.monotonic()
+            if self.idle_timeout > 0 and self._watcher is None:
+                self._watcher = threading.Thread(target=self._watch, daemon=True)
+                self._watcher.start()
+        return results
+
+    def _watch(self) -> None:
+        while True:
+            with self._lock:
+                remaining = self._last_used + self.idle_timeout - time.monotonic()
+                if remaining <= 0 or self.backend is None:
+                    self._watcher = None
+                    self._unload()
+                    return
+            if self._closed.wait(remaining):
+                return
+
+    def _unload(self) -> bool:
+        if self.backend is None:
+            return False
+        before = process_rss()
+        self.backend = None
+        release_memory()
+        after = process_rss()
+        released = None if before is None or after is None else before - after
+        logger.info(f"Unloaded idle OCR models, released {format_bytes(released)}")
+        return True
+
+    def unload_idle(self) -> bool:
+        """Drops the models if unused for ``idle_timeout``; returns whether it did.
+
+        Models in use, e.g. mid-scan, stay loaded so memory pressure doesn't
+        turn into an unload/reload loop.
+        """
+        with self._lock:
+            if time.monotonic() - self._last_used < self.idle_timeout:
+                return False
+            return self._unload()
+
+    def memory_bytes(self) -> int:
+        backend = self.backend
+        return backend.memory_bytes() if backend is not None else 0
+
+    def memory_usage(self) -> Dict[str, Optional[int]]:
+        backend = self.backend
+        return backend.memory_usage() if backend is not None else {"models": 0}
+
+    def close(self) -> None:
+        self._closed.set()
+        with self._lock:
+            self._unload()
+
+
+OCR_BACKENDS: Dict[str, type] = {
+    EasyOCRBackend.name: EasyOCRBackend,
+    QuantizedEasyOCRBackend.name: QuantizedEasyOCRBackend,
+}
+
+
+def create_ocr_backend(
+    name: Optional[str] = None,
+    language: str = Config.OCR_LANGUAGE,
+    lazy: Optional[bool] = None,
+) -> OCRBackend:
+    """Builds an OCR backend; in low-memory mode its models load on first use."""
+    name = name or Config.OCR_BACKEND
+    if name not in OCR_BACKENDS:
+        raise ValueError(
+            f"Unknown OCR backend {name!r}; expected one of {sorted(OCR_BACKENDS)}"
+        )
+    if Config.LOW_MEMORY_MODE if lazy is None else lazy:
+        return LazyOCRBackend(name, language)
+    return OCR_BACKENDS[name](language)
+
+
+def compare_backends(
+    corpus_dir: Path,
+    reference: OCRBackend,
+    candidate: OCRBackend,
+    **kwargs: Any,
+) -> Dict[str, Any]:
+    """Runs both backends over every image in ``corpus_dir`` and reports text parity."""
+    import cv2
+
+    mismatches: List[Dict[str, str]] = []
+    total = 0
+    for path in sorted(Path(corpus_dir).glob("*.png")):
+        image = cv2.imread(str(path))
+        if image is None:
+            continue
+        total += 1
+        expected = " ".join(r[1] for r in reference.readtext(image, **kwargs))
+        actual = " ".join(r[1] for r in candidate.readtext(image, **kwargs))
+        if expected != actual:
+            mismatches.append(
+                {"file": path.name, "expected": expected, "actual": actual}
+            )
+
+    return {
+        "total": total,
+        "matches": total - len(mismatches),
+        "agreement": (total - len(mismatches)) / total if total else 1.0,
+        "mismatches": mismatches,
+    }
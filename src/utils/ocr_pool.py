@@ -0,0 +1,257 @@
+import itertools
+import logging
+import multiprocessing as mp
+import os
+import queue
+import threading
+from concurrent.futures import Future, InvalidStateError
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.config import Config
+from src.utils.memory import process_rss
+
+logger = logging.getLogger(__name__)
+
+
+def _worker_main(
+    task_queue: "mp.Queue",
+    result_queue: "mp.Queue",
+    backend_name: str,
+    language: str,
+    torch_threads: int,
+) -> None:
+    """Entry point of an OCR worker process. Owns a single OCR backend."""
+    import cv2
+    import torch
+
+    torch.set_num_threads(torch_threads)
+    torch.set_num_interop_threads(1)
+    cv2.setNumThreads(1)
+
+    from src.utils.ocr_backend import create_ocr_backend
+
+    reader = create_ocr_backend(backend_name, language)
+    result_queue.put(("ready", os.getpid(), None))
+
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+
+        job_id, shm_name, shape, dtype, kwargs = task
+        # Lets the pool fail this job if the process dies while running it
+        result_queue.put(("started", os.getpid(), job_id))
+        try:
+            shm = shared_memory.SharedMemory(name=shm_name)
+            try:
+                image = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+                results = reader.readtext(image, **kwargs)
+                # Copy out everything before the view over the block is released
+                payload = [
+                    ([[int(x), int(y)] for x, y in bbox], str(text), float(conf))
+                    for bbox, text, conf in results
+                ]
+                del image
+            finally:
+                shm.close()
+            result_queue.put((job_id, payload, None))
+        except Exception as e:
+            result_queue.put((job_id, None, f"{type(e).__name__}: {e}"))
+
+
+class OCRWorkerPool:
+    """Pool of OCR processes, each holding its own OCR backend instance.
+
+    Images are copied once into a shared memory block and only the block name
+    travels through the task queue, so frames are never pickled. Exposes the
+    same ``readtext`` call as ``OCRBackend`` so it can be handed to
+    ``OCRProcessor`` as a drop-in reader.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        torch_threads: Optional[int] = None,
+        language: str = Config.OCR_LANGUAGE,
+        backend_name: Optional[str] = None,
+    ) -> None:
+        cpu_count = os.cpu_count() or 1
+        self.workers: int = workers or Config.OCR_WORKERS or cpu_count
+        self.torch_threads: int = (
+            torch_threads
+            or Config.OCR_TORCH_THREADS
+            or max(1, cpu_count // self.workers)
+        )
+        self.language = language
+        self.backend_name: str = backend_name or Config.OCR_BACKEND
+
+        ctx = mp.get_context("spawn")
+        self._task_queue = ctx.Queue()
+        self._result_queue = ctx.Queue()
+        self._processes = [
+            ctx.Process(
+                target=_worker_main,
+                args=(
+                    self._task_queue,
+                    self._result_queue,
+                    self.backend_name,
+                    self.language,
+                    self.torch_threads,
+                ),
+                daemon=True,
+            )
+            for _ in range(self.workers)
+        ]
+        for process in self._processes:
+            process.start()
+
+        self._job_ids = itertools.count()
+        self._lock = threading.Lock()
+        self._pending: Dict[int, Tuple[Future, shared_memory.SharedMemory]] = {}
+        # Job each worker process is running, by pid
+        self._running: Dict[int, int] = {}
+        self._dead: Set[int] = set()
+        self._free_blocks: List[shared_memory.SharedMemory] = []
+        self._closed = False
+
+        self._collector = threading.Thread(target=self._collect_results, daemon=True)
+        self._collector.start()
+
+    def _acquire_block(self, nbytes: int) -> shared_memory.SharedMemory:
+        with self._lock:
+            for i, block in enumerate(self._free_blocks):
+                if block.size >= nbytes:
+                    return self._free_blocks.pop(i)
+        return shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+
+    def _release_block(self, block: shared_memory.SharedMemory) -> None:
+        with self._lock:
+            if not self._closed and len(self._free_blocks) < self.workers * 2:
+                self._free_blocks.append(block)
+                return
+        block.close()
+        block.unlink()
+
+    def submit(self, image: np.ndarray, **kwargs: Any) -> "Future[List[Any]]":
+        """Queues ``image`` for recognition and returns a future of readtext results."""
+        if self._closed:
+            raise RuntimeError("OCR worker pool is closed")
+        if len(self._dead) == len(self._processes):
+            raise RuntimeError("Every OCR worker process has exited")
+
+        image = np.ascontiguousarray(image)
+        block = self._acquire_block(image.nbytes)
+        np.ndarray(image.shape, dtype=image.dtype, buffer=block.buf)[...] = image
+
+        future: "Future[List[Any]]" = Future()
+        job_id = next(self._job_ids)
+        with self._lock:
+            self._pending[job_id] = (future, block)
+        self._task_queue.put((job_id, block.name, image.shape, image.dtype.str, kwargs))
+        return future
+
+    def readtext(self, image: np.ndarray, **kwargs: Any) -> List[Any]:
+        return self.submit(image, **kwargs).result(timeout=Config.OCR_RESULT_TIMEOUT)
+
+    def memory_usage(self) -> Dict[str, Optional[int]]:
+        """RSS of every worker process plus the shared memory blocks in use."""
+        usage = {
+            f"worker{i}": process_rss(process.pid) if process.is_alive() else 0
+            for i, process in enumerate(self._processes)
+        }
+        with self._lock:
+            blocks = self._free_blocks + [block for _, block in self._pending.values()]
+        usage["shared_memory"] = sum(block.size for block in blocks)
+        return usage
+
+    def _collect_results(self) -> None:
+        while True:
+            try:
+                message = self._result_queue.get(timeout=0.5)
+            except queue.Empty:
+                if self._closed:
+                    return
+                self._check_workers()
+                continue
+            except (EOFError, OSError):
+                return
+
+            if message[0] == "ready":
+                continue
+            if message[0] == "started":
+                _tag, pid, job_id = message
+                self._running[pid] = job_id
+                if pid in self._dead:
+                    self._finish(job_id, None, "OCR worker process exited")
+                continue
+
+            self._finish(*message)
+            self._check_workers()
+
+    def _finish(
+        self, job_id: int, payload: Optional[List[Any]], error: Optional[str]
+    ) -> None:
+        with self._lock:
+            pending = self._pending.pop(job_id, None)
+        if pending is None:
+            # Already failed because its worker was reported dead
+            return
+        future, block = pending
+        self._release_block(block)
+
+        # The caller may have cancelled the future while it was queued
+        if future.done():
+            return
+        try:
+            if error is not None:
+                future.set_exception(RuntimeError(error))
+            else:
+                future.set_result(payload)
+        except InvalidStateError:
+            pass
+
+    def _check_workers(self) -> None:
+        """Fails the jobs of worker processes that exited without finishing them."""
+        for process in self._processes:
+            if process.pid in self._dead or process.is_alive():
+                continue
+            self._dead.add(process.pid)
+            logger.error(
+                f"OCR worker {process.pid} exited with code {process.exitcode}"
+            )
+            job_id = self._running.pop(process.pid, None)
+            if job_id is not None:
+                self._finish(job_id, None, "OCR worker process exited")
+
+        if self._processes and len(self._dead) == len(self._processes):
+            # Nothing is left to take the queued jobs
+            with self._lock:
+                job_ids = list(self._pending)
+            for job_id in job_ids:
+                self._finish(job_id, None, "Every OCR worker process has exited")
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        for _ in self._processes:
+            self._task_queue.put(None)
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+        with self._lock:
+            self._closed = True
+            pending = list(self._pending.values())
+            self._pending.clear()
+            free_blocks, self._free_blocks = self._free_blocks, []
+
+        for future, block in pending:
+            future.cancel()
+            free_blocks.append(block)
+        for block in free_blocks:
+            block.close()
+            block.unlink()
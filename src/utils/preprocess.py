@@ -0,0 +1,106 @@
+import threading
+from typing import Dict, Tuple
+
+import cv2
+import numpy as np
+
+# Hue bands (OpenCV 0-179 scale) kept by the rarity preprocessing and the
+# minimum saturation/value each one requires: orange (SSR), blue (R), pink (SR)
+RARITY_HUE_BANDS = [((0, 30), 100), ((90, 130), 50), ((140, 170), 50)]
+
+
+def build_hue_threshold_lut() -> np.ndarray:
+    """Maps hue to the value min(S, V) must exceed for the pixel to be kept.
+
+    Hues outside every band map to 255, which no 8-bit value exceeds, so the
+    three ``inRange`` masks and their ORs collapse into one LUT lookup and one
+    comparison.
+    """
+    lut = np.full((1, 256), 255, dtype=np.uint8)
+    for (low, high), minimum in RARITY_HUE_BANDS:
+        lut[0, low : high + 1] = minimum - 1
+    return lut
+
+
+class PreprocessEngine:
+    """ROI preprocessing that reuses its output and intermediate buffers.
+
+    Buffers are allocated once per ROI shape and per thread, and every OpenCV
+    call writes into them through ``dst=``. Returned arrays are those buffers:
+    they are overwritten by the next call with the same shape on the same
+    thread, so copy them if they must outlive it.
+    """
+
+    def __init__(self, clip_limit: float = 3.0, tile_grid_size: int = 8) -> None:
+        self.clip_limit = clip_limit
+        self.tile_grid_size = tile_grid_size
+        self.hue_threshold_lut = build_hue_threshold_lut()
+        self._local = threading.local()
+
+    def _buffers(self, kind: str, shape: Tuple[int, ...]) -> Dict[str, np.ndarray]:
+        cache = self._local.__dict__.setdefault("buffers", {})
+        key = (kind, shape)
+        if key not in cache:
+            height, width = shape[0], shape[1]
+            plane = (height, width)
+            if kind == "rarity":
+                cache[key] = {
+                    "hsv": np.empty((height, width, 3), np.uint8),
+                    "hue": np.empty(plane, np.uint8),
+                    "sat": np.empty(plane, np.uint8),
+                    "val": np.empty(plane, np.uint8),
+                    "threshold": np.empty(plane, np.uint8),
+                    "mask": np.empty(plane, np.uint8),
+                    "masked": np.empty((height, width, 3), np.uint8),
+                    "lab": np.empty((height, width, 3), np.uint8),
+                    "lightness": np.empty(plane, np.uint8),
+                    "equalized": np.empty(plane, np.uint8),
+                    "result": np.empty((height, width, 3), np.uint8),
+                }
+            else:
+                cache[key] = {
+                    "gray": np.empty(plane, np.uint8),
+                    "binary": np.empty(plane, np.uint8),
+                }
+        return cache[key]
+
+    def _clahe(self) -> "cv2.CLAHE":
+        clahe = getattr(self._local, "clahe", None)
+        if clahe is None:
+            clahe = cv2.createCLAHE(
+                clipLimit=self.clip_limit,
+                tileGridSize=(self.tile_grid_size, self.tile_grid_size),
+            )
+            self._local.clahe = clahe
+        return clahe
+
+    def enhance_rarity(self, roi: np.ndarray) -> np.ndarray:
+        """Keeps the rarity colour bands and boosts their contrast with CLAHE."""
+        b = self._buffers("rarity", roi.shape)
+
+        cv2.cvtColor(roi, cv2.COLOR_BGR2HSV, dst=b["hsv"])
+        cv2.extractChannel(b["hsv"], 0, dst=b["hue"])
+        cv2.extractChannel(b["hsv"], 1, dst=b["sat"])
+        cv2.extractChannel(b["hsv"], 2, dst=b["val"])
+        cv2.min(b["sat"], b["val"], dst=b["sat"])
+        cv2.LUT(b["hue"], self.hue_threshold_lut, dst=b["threshold"])
+        cv2.compare(b["sat"], b["threshold"], cv2.CMP_GT, dst=b["mask"])
+
+        b["masked"].fill(0)
+        cv2.copyTo(roi, b["mask"], dst=b["masked"])
+
+        cv2.cvtColor(b["masked"], cv2.COLOR_BGR2LAB, dst=b["lab"])
+        cv2.extractChannel(b["lab"], 0, dst=b["lightness"])
+        self._clahe().apply(b["lightness"], dst=b["equalized"])
+        cv2.insertChannel(b["equalized"], b["lab"], 0)
+        cv2.cvtColor(b["lab"], cv2.COLOR_LAB2BGR, dst=b["result"])
+        return b["result"]
+
+    def binarize(self, image: np.ndarray) -> np.ndarray:
+        """Grayscale plus Otsu threshold, as used before name and CP OCR."""
+        b = self._buffers("binary", image.shape)
+        cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=b["gray"])
+        cv2.threshold(
+            b["gray"], 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=b["binary"]
+        )
+        return b["binary"]
@@ -0,0 +1,191 @@
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from src.config import Config
+from src.utils.memory import MIB, ByteLRUCache
+
+# Constants of the standard SSIM definition (Wang et al.), as used by scikit-image
+SSIM_K1 = 0.01
+SSIM_K2 = 0.03
+SSIM_DATA_RANGE = 255.0
+# OpenCV filters handle at most this many channels per call
+MAX_CHANNELS = 512
+
+
+def to_gray(image: np.ndarray) -> np.ndarray:
+    if image.ndim == 2:
+        return image
+    if image.shape[2] == 4:
+        return cv2.cvtColor(image, cv2.COLOR_BGRA2GRAY)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+def ssim_batch(
+    query: np.ndarray, references: np.ndarray, win_size: int = Config.SSIM_WIN_SIZE
+) -> np.ndarray:
+    """Mean SSIM of one ``(H, W)`` query against ``(H, W, N)`` stacked references.
+
+    Matches ``skimage.metrics.structural_similarity`` with its default uniform
+    window and sample covariance, but filters every reference in one OpenCV
+    call per statistic and never materialises a per-pair similarity map
+    beyond what the mean needs.
+    """
+    if references.ndim == 2:
+        references = references[:, :, np.newaxis]
+    if references.shape[2] > MAX_CHANNELS:
+        return np.concatenate(
+            [
+                ssim_batch(query, references[:, :, i : i + MAX_CHANNELS], win_size)
+                for i in range(0, references.shape[2], MAX_CHANNELS)
+            ]
+        )
+
+    x = query.astype(np.float32, copy=False)
+    y = references.astype(np.float32, copy=False)
+    ksize = (win_size, win_size)
+    cov_norm = win_size**2 / (win_size**2 - 1)
+    c1 = (SSIM_K1 * SSIM_DATA_RANGE) ** 2
+    c2 = (SSIM_K2 * SSIM_DATA_RANGE) ** 2
+
+    def box(a: np.ndarray) -> np.ndarray:
+        filtered = cv2.boxFilter(a, -1, ksize, borderType=cv2.BORDER_REFLECT)
+        return filtered.reshape(a.shape)
+
+    ux = box(x)[:, :, np.newaxis]
+    uy = box(y)
+    vx = cov_norm * (box(x * x)[:, :, np.newaxis] - ux * ux)
+    vy = cov_norm * (box(y * y) - uy * uy)
+    vxy = cov_norm * (box(x[:, :, np.newaxis] * y) - ux * uy)
+
+    s = ((2 * ux * uy + c1) * (2 * vxy + c2)) / (
+        (ux * ux + uy * uy + c1) * (vx + vy + c2)
+    )
+    pad = (win_size - 1) // 2
+    return s[pad:-pad, pad:-pad].mean(axis=(0, 1), dtype=np.float64)
+
+
+class SimilarityEngine:
+    """Ranks many reference images against one query, coarse to fine.
+
+    All candidates are scored together at the coarsest pyramid level; only the
+    best ``top_k`` are refined level by level up to the query resolution.
+    Coarse levels of each reference are cached per query size within a byte
+    budget, so repeated lookups only load the full-resolution survivors.
+    """
+
+    def __init__(
+        self,
+        levels: int = Config.SSIM_PYRAMID_LEVELS,
+        top_k: int = Config.SSIM_TOP_K,
+        win_size: int = Config.SSIM_WIN_SIZE,
+        cache_bytes: int = Config.SIMILARITY_CACHE_MB * MIB,
+    ) -> None:
+        self.levels = levels
+        self.top_k = top_k
+        self.win_size = win_size
+        # Coarse pyramid levels per (key, query shape), least recently used evicted
+        self.cache = ByteLRUCache(cache_bytes)
+
+    def _levels_for(self, shape: Tuple[int, int]) -> int:
+        levels, height, width = 0, shape[0], shape[1]
+        while levels < self.levels and min(height, width) // 2 >= 2 * self.win_size:
+            height, width = (height + 1) // 2, (width + 1) // 2
+            levels += 1
+        return levels
+
+    def _build_pyramid(self, image: np.ndarray, levels: int) -> List[np.ndarray]:
+        pyramid = [image.astype(np.float32)]
+        for _ in range(levels):
+            pyramid.append(cv2.pyrDown(pyramid[-1]))
+        return pyramid
+
+    def _reference_pyramid(
+        self,
+        key: str,
+        shape: Tuple[int, int],
+        levels: int,
+        load: Callable[[str], Optional[np.ndarray]],
+    ) -> Optional[List[np.ndarray]]:
+        cached = self.cache.get((key, shape))
+        if cached is not None and len(cached) >= levels:
+            return cached
+
+        image = load(key)
+        if image is None:
+            return None
+        image = cv2.resize(to_gray(image), (shape[1], shape[0]))
+        # Level 0 is too large to keep for every reference; survivors are reloaded
+        pyramid = self._build_pyramid(image, levels)
+        self.cache.put((key, shape), pyramid[1:])
+        return pyramid[1:]
+
+    def rank(
+        self,
+        query: np.ndarray,
+        keys: Sequence[str],
+        load: Callable[[str], Optional[np.ndarray]],
+    ) -> List[Tuple[str, float]]:
+        """Returns ``(key, score)`` pairs, best first, for the refined candidates."""
+        query = to_gray(query)
+        shape = (query.shape[0], query.shape[1])
+        levels = self._levels_for(shape) if len(keys) > self.top_k else 0
+        query_pyramid = self._build_pyramid(query, levels)
+
+        coarse: Dict[str, List[np.ndarray]] = {}
+        for key in keys:
+            pyramid = (
+                self._reference_pyramid(key, shape, levels, load) if levels else []
+            )
+            if pyramid is not None:
+                coarse[key] = pyramid
+
+        candidates = list(coarse)
+        scores = np.empty(0)
+        for level in range(levels, -1, -1):
+            if not candidates:
+                return []
+            if level == 0:
+                stack = [self._full_res(key, shape, load) for key in candidates]
+                keep = [i for i, image in enumerate(stack) if image is not None]
+                candidates = [candidates[i] for i in keep]
+                if not candidates:
+                    return []
+                refs = np.dstack([stack[i] for i in keep])
+            else:
+                refs = np.dstack([coarse[key][level - 1] for key in candidates])
+
+            scores = ssim_batch(query_pyramid[level], refs, self.win_size)
+            order = np.argsort(-scores)
+            if level > 0:
+                order = order[: self.top_k]
+            candidates = [candidates[i] for i in order]
+            scores = scores[order]
+
+        return list(zip(candidates, scores.tolist()))
+
+    def _full_res(
+        self,
+        key: str,
+        shape: Tuple[int, int],
+        load: Callable[[str], Optional[np.ndarray]],
+    ) -> Optional[np.ndarray]:
+        image = load(key)
+        if image is None:
+            return None
+        return cv2.resize(to_gray(image), (shape[1], shape[0])).astype(np.float32)
+
+    def best_match(
+        self,
+        query: np.ndarray,
+        keys: Sequence[str],
+        load: Callable[[str], Optional[np.ndarray]],
+    ) -> Optional[Tuple[str, float]]:
+        ranking = self.rank(query, keys, load)
+        return ranking[0] if ranking else None
+
+    def score(self, img1: np.ndarray, img2: np.ndarray) -> float:
+        query = to_gray(img1)
+        reference = cv2.resize(to_gray(img2), (query.shape[1], query.shape[0]))
+        return float(ssim_batch(query, reference.astype(np.float32), self.win_size)[0])
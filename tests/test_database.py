@@ -0,0 +1,22 @@
+import csv
+
+from src.data.database import NikkeDatabase
+
+
+def test_exports_are_finalized_when_a_scan_ends(tmp_path):
+    database = NikkeDatabase(tmp_path, export_formats=["csv"])
+    database.add_or_update_character("Anis", {"rarity": "SR"})
+    database.finish_scan()
+
+    assert not list(tmp_path.glob("*.partial"))
+    (export,) = tmp_path.glob("*.csv")
+
+    # A second scan into the same output rewrites the export with every result
+    database.add_or_update_character("Neon", {"rarity": "SR"})
+    database.finish_scan()
+    database.close()
+
+    with open(export, newline="", encoding="utf-8") as f:
+        names = [row["name"] for row in csv.DictReader(f)]
+    assert names == ["Anis", "Neon"]
+    assert not list(tmp_path.glob("*.partial"))
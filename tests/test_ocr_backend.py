@@ -0,0 +1,50 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.config import Config
+
+# Share of images whose int8 text must equal the stock easyocr output
+MIN_AGREEMENT = 0.98
+
+# Text shaped like the name and combat power regions of a character screen
+SAMPLE_TEXT = ["Anis", "Neon", "Rapi", "Marian", "Snow White", "12,345", "98,760"]
+
+
+def write_text_images(directory) -> None:
+    for i, text in enumerate(SAMPLE_TEXT):
+        image = np.full((60, 40 + 26 * len(text), 3), 255, dtype=np.uint8)
+        cv2.putText(image, text, (20, 42), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 0), 2)
+        cv2.imwrite(str(directory / f"{i:03d}.png"), image)
+
+
+@pytest.fixture(scope="module")
+def backends():
+    pytest.importorskip("easyocr")
+    from src.utils.ocr_backend import create_ocr_backend
+
+    return (
+        create_ocr_backend("easyocr", lazy=False),
+        create_ocr_backend("easyocr-int8", lazy=False),
+    )
+
+
+def test_int8_backend_matches_stock_easyocr_on_rendered_text(backends, tmp_path):
+    from src.utils.ocr_backend import compare_backends
+
+    write_text_images(tmp_path)
+    report = compare_backends(tmp_path, *backends)
+
+    assert report["total"] == len(SAMPLE_TEXT)
+    assert report["agreement"] >= MIN_AGREEMENT, report["mismatches"]
+
+
+def test_int8_backend_matches_stock_easyocr_on_benchmark_screenshots(backends):
+    from src.utils.ocr_backend import compare_backends
+
+    corpus = Config.OCR_BENCHMARK_DIR
+    if not any(corpus.glob("*.png")):
+        pytest.skip(f"No OCR benchmark screenshots in {corpus}")
+    report = compare_backends(corpus, *backends)
+
+    assert report["agreement"] >= MIN_AGREEMENT, report["mismatches"]
@@ -0,0 +1,147 @@
+from pathlib import Path
+from typing import Any, List
+
+import cv2
+import numpy as np
+
+from src.automation.simulator import SimulatedGame, simulate_scan, simulate_sessions
+from src.config import Config
+from src.data.roster import RosterIndex
+from src.utils.fingerprint import crop
+from src.utils.image_processor import ImageProcessor, OCRProcessor
+from src.utils.ocr_backend import OCRBackend, OCRResult
+from src.utils.preprocess import PreprocessEngine
+
+NAMES = ["Anis", "Neon", "Rapi", "Marian"]
+NAME_SHAPE = (
+    Config.NAME_ROI[3] - Config.NAME_ROI[1],
+    Config.NAME_ROI[2] - Config.NAME_ROI[0],
+)
+BOX = [[0, 0], [1, 0], [1, 1], [0, 1]]
+
+
+class ScreenTextOCR(OCRBackend):
+    """Reads the text the simulated game is showing instead of running a model."""
+
+    name = "screen-text"
+
+    def __init__(self, game: SimulatedGame) -> None:
+        self.game = game
+
+    def readtext(self, image: np.ndarray, **kwargs: Any) -> List[OCRResult]:
+        if "allowlist" in kwargs:
+            return [(BOX, "SSR", 1.0)]
+        if image.shape[:2] == NAME_SHAPE:
+            return [(BOX, NAMES[self.game.index], 1.0)]
+        return [(BOX, "12,345", 1.0)]
+
+
+class FlakyOCR(ScreenTextOCR):
+    """Fails the first name read of one character, like a crashed OCR worker."""
+
+    def __init__(self, game: SimulatedGame, failing_name: str) -> None:
+        super().__init__(game)
+        self.failing_name = failing_name
+
+    def readtext(self, image: np.ndarray, **kwargs: Any) -> List[OCRResult]:
+        results = super().readtext(image, **kwargs)
+        if results and results[0][1] == self.failing_name:
+            self.failing_name = None
+            raise RuntimeError("OCR worker process exited")
+        return results
+
+
+class RecordedNameOCR(OCRBackend):
+    """Recognizes names by their binarized region, so one instance serves many games."""
+
+    name = "recorded-names"
+
+    def __init__(self, frames: List[Path]) -> None:
+        preprocess = PreprocessEngine()
+        self.names = {}
+        for path, name in zip(frames, NAMES):
+            name_roi = crop(cv2.imread(str(path)), Config.NAME_ROI)
+            self.names[preprocess.binarize(name_roi).tobytes()] = name
+
+    def readtext(self, image: np.ndarray, **kwargs: Any) -> List[OCRResult]:
+        if "allowlist" not in kwargs and image.shape[:2] == NAME_SHAPE:
+            return [(BOX, self.names[image.tobytes()], 1.0)]
+        return [(BOX, "SSR" if "allowlist" in kwargs else "12,345", 1.0)]
+
+
+def write_frames(directory, count: int) -> None:
+    rng = np.random.default_rng(0)
+    left, top, right, bottom = Config.RARITY_ROI
+    for i in range(count):
+        blocks = rng.integers(0, 256, (27, 48, 3), dtype=np.uint8)
+        frame = cv2.resize(blocks, (1920, 1080), interpolation=cv2.INTER_NEAREST)
+        frame[top:bottom, left:right] = (0, 128, 255)  # SSR orange
+        cv2.imwrite(str(directory / f"{i:03d}.png"), frame)
+
+
+def make_roster() -> RosterIndex:
+    return RosterIndex.from_records(
+        [
+            {"name": name, "rarity": "SSR", "images": {"big": f"{name}.png"}}
+            for name in NAMES
+        ]
+    )
+
+
+def make_game(tmp_path) -> SimulatedGame:
+    recording = tmp_path / "recording"
+    recording.mkdir()
+    write_frames(recording, len(NAMES))
+    return SimulatedGame.from_directory(recording, transition_delay=0, popup_delay=0)
+
+
+def test_simulated_scan_visits_every_character_once(tmp_path):
+    game = make_game(tmp_path)
+    roster = make_roster()
+    image_processor = ImageProcessor(OCRProcessor(ScreenTextOCR(game)))
+
+    report = simulate_scan(
+        game, image_processor, roster, tmp_path / "output", time_scale=0, max_steps=50
+    )
+
+    assert report["completed"]
+    assert report["characters"] == len(NAMES)
+    assert report["stored"] == len(NAMES)
+
+
+def test_failed_frame_is_retried(tmp_path):
+    game = make_game(tmp_path)
+    image_processor = ImageProcessor(OCRProcessor(FlakyOCR(game, NAMES[1])))
+
+    report = simulate_scan(
+        game,
+        image_processor,
+        make_roster(),
+        tmp_path / "output",
+        time_scale=0,
+        max_steps=50,
+    )
+
+    assert report["completed"]
+    assert report["stored"] == len(NAMES)
+
+
+def test_every_session_reports_what_it_stored(tmp_path):
+    game = make_game(tmp_path)
+    image_processor = ImageProcessor(OCRProcessor(RecordedNameOCR(game.characters)))
+
+    report = simulate_sessions(
+        tmp_path / "recording",
+        2,
+        make_roster(),
+        tmp_path / "output",
+        time_scale=0,
+        timeout=60,
+        image_processor=image_processor,
+        transition_delay=0,
+        popup_delay=0,
+    )
+
+    assert report["completed"]
+    assert report["stored_per_session"] == {"sim0": len(NAMES), "sim1": len(NAMES)}
+    assert report["stored"] == 2 * len(NAMES)